@@ -2,13 +2,20 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 import time
-from dataclasses import dataclass, asdict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
 from playwright.sync_api import Page
 
+try:
+    import orjson  # optional: faster result/index serialization
+except ImportError:
+    orjson = None
+
 
 def load_dotenv(dotenv_path: Path) -> None:
     """
@@ -30,6 +37,13 @@ def load_dotenv(dotenv_path: Path) -> None:
             os.environ[k] = v
 
 
+def dumps_bytes(obj, *, indent: bool = False) -> bytes:
+    """JSON-encode `obj` to UTF-8 bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
+
+
 def now_utc() -> str:
     return datetime.utcnow().isoformat() + "Z"
 
@@ -47,12 +61,34 @@ def safe_filename(label: str) -> str:
     return safe[:120] if safe else "step"
 
 
+# Screenshot bytes are captured inline but written to disk in the background.
+_SHOT_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="shot")
+_pending_shots: list[Future] = []
+_pending_lock = threading.Lock()
+
+
 def shot(page: Page, folder: Path, label: str) -> str:
     out = folder / f"{safe_filename(label)}_{int(time.time() * 1000)}.png"
-    page.screenshot(path=str(out), full_page=True)
+    buf = page.screenshot(full_page=True)
+    fut = _SHOT_POOL.submit(out.write_bytes, buf)
+    with _pending_lock:
+        _pending_shots.append(fut)
     return str(out)
 
 
+def wants_shot(ok: bool) -> bool:
+    """SCREENSHOT_MODE=failures (default) only captures failed steps; SCREENSHOT_MODE=all captures every step."""
+    return not ok or os.getenv("SCREENSHOT_MODE", "failures").strip().lower() == "all"
+
+
+def flush_shots() -> None:
+    """Block until every screenshot queued by shot() has been written."""
+    with _pending_lock:
+        pending = list(_pending_shots)
+        _pending_shots.clear()
+    wait(pending)
+
+
 @dataclass
 class Step:
     name: str
@@ -69,20 +105,31 @@ def write_result(
     test_email: str,
     steps: list[Step],
     artifacts: dict,
-) -> None:
+) -> dict:
+    # Make sure every screenshot path referenced by `steps` exists before the result is published.
+    flush_shots()
+    # Single pass over steps; Step is flat, so build dicts directly rather than via asdict()'s deepcopy.
+    passed = 0
+    step_dicts: list[dict] = []
+    for s in steps:
+        if s.passed:
+            passed += 1
+        step_dicts.append({"name": s.name, "passed": s.passed, "note": s.note, "screenshot": s.screenshot, "at": s.at})
+    total = len(steps)
     summary = {
         "run_at_utc": now_utc(),
         "base_url": base_url,
         "email": test_email,
         "summary": {
-            "total": len(steps),
-            "passed": sum(1 for s in steps if s.passed),
-            "failed": sum(1 for s in steps if not s.passed),
+            "total": total,
+            "passed": passed,
+            "failed": total - passed,
         },
         "artifacts": artifacts,
-        "steps": [asdict(s) for s in steps],
+        "steps": step_dicts,
     }
-    out_path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    out_path.write_bytes(dumps_bytes(summary, indent=True))
+    return summary
 
 
 def require_env(key: str) -> str:
@@ -9,20 +9,30 @@ Guidelines:
 
 from __future__ import annotations
 
+import functools
+import itertools
 import json
 import os
 import re
 import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from playwright.sync_api import sync_playwright
 
-from common import Step, load_dotenv, mk_run_dir, now_utc, require_env, shot, write_result
+from common import Step, load_dotenv, mk_run_dir, now_utc, require_env, shot, wants_shot, write_result
 
 
 HERE = Path(__file__).resolve().parent
 RUN_ROOT = HERE / "runs"
+AUTH_STATE = RUN_ROOT / "auth.json"
+TOKEN_TTL_SEC = 25 * 60
+_PATH_PARAM_RE = re.compile(r":([A-Za-z_][A-Za-z0-9_]*)")
+
+# Route keywords that make a page worth "using", highest priority first.
+_SCORE_KEYS = ("dashboard", "report", "setting", "wallet", "account", "action")
+_SCORE_WEIGHTS = {k: 100 - i * 5 for i, k in enumerate(_SCORE_KEYS)}
+_SCORE_RE = re.compile("|".join(_SCORE_KEYS))
 
 
 class SafeMap(dict):
@@ -30,10 +40,8 @@ class SafeMap(dict):
         return "{" + key + "}"
 
 
-def read_paths() -> list[str]:
-    p = HERE / "paths.txt"
-    if not p.exists():
-        return ["/dashboard", "/reports", "/settings"]
+@functools.lru_cache(maxsize=4)
+def _load_paths(p: Path, mtime_ns: int) -> tuple[str, ...]:
     out: list[str] = []
     for raw in p.read_text(encoding="utf-8").splitlines():
         s = raw.strip()
@@ -42,29 +50,93 @@ def read_paths() -> list[str]:
         if not s.startswith("/"):
             s = "/" + s
         out.append(s)
-    return out
+    return tuple(out)
+
+
+def read_paths() -> list[str]:
+    p = HERE / "paths.txt"
+    if not p.exists():
+        return ["/dashboard", "/reports", "/settings"]
+    return list(_load_paths(p, p.stat().st_mtime_ns))
+
+
+@functools.lru_cache(maxsize=4)
+def _load_workflow_plan(p: Path, mtime_ns: int) -> dict:
+    try:
+        data = json.loads(p.read_text(encoding="utf-8"))
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
 
 
 def read_workflow_plan() -> dict:
+    """
+    Parsed workflow_plan.json, cached until the file's mtime changes.
+    Returns a shallow copy; nested plan entries are shared and must be treated as read-only.
+    """
     p = HERE / "workflow_plan.json"
     if not p.exists():
         return {}
+    return dict(_load_workflow_plan(p, p.stat().st_mtime_ns))
+
+
+def _read_auth_cache(base_url: str, email: str) -> dict:
+    if not AUTH_STATE.exists():
+        return {}
     try:
-        data = json.loads(p.read_text(encoding="utf-8"))
-        return data if isinstance(data, dict) else {}
+        data = json.loads(AUTH_STATE.read_text(encoding="utf-8"))
     except Exception:
         return {}
+    if not isinstance(data, dict) or data.get("base_url") != base_url or data.get("email") != email:
+        return {}
+    return data
 
 
-def prioritize_use_paths(paths: list[str], limit: int = 8) -> list[str]:
-    keys = ("dashboard", "report", "setting", "wallet", "account", "action")
+def _update_auth_cache(base_url: str, email: str, **fields: Any) -> None:
+    data = _read_auth_cache(base_url, email)
+    data.update(fields, base_url=base_url, email=email)
+    AUTH_STATE.parent.mkdir(parents=True, exist_ok=True)
+    # Owner-only: the cache holds live session cookies and the bearer token.
+    fd = os.open(AUTH_STATE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        fh.write(json.dumps(data))
+    os.chmod(AUTH_STATE, 0o600)  # O_CREAT's mode only applies when the file is new
+
+
+def load_auth_state(base_url: str, email: str) -> dict:
+    """
+    Return the cached Playwright storage_state for (base_url, email), or {} if none/mismatched.
+    """
+    state = _read_auth_cache(base_url, email).get("storage_state")
+    return state if isinstance(state, dict) and state.get("cookies") else {}
+
 
+def save_auth_state(context, base_url: str, email: str) -> None:
+    _update_auth_cache(base_url, email, storage_state=context.storage_state())
+
+
+def load_cached_token(base_url: str, email: str) -> str | None:
+    """
+    Return the cached API token if it has not expired ("" means cookie auth only), else None.
+    """
+    data = _read_auth_cache(base_url, email)
+    if "token" not in data or time.time() >= float(data.get("token_expires_at") or 0):
+        return None
+    return str(data.get("token") or "")
+
+
+def save_cached_token(base_url: str, email: str, token: str) -> None:
+    _update_auth_cache(base_url, email, token=token, token_expires_at=time.time() + TOKEN_TTL_SEC)
+
+
+def invalidate_auth_state() -> None:
+    AUTH_STATE.unlink(missing_ok=True)
+
+
+def prioritize_use_paths(paths: list[str], limit: int = 8) -> list[str]:
     def score(p: str) -> int:
-        s = 0
-        lp = p.lower()
-        for i, k in enumerate(keys):
-            if k in lp:
-                s += 100 - i * 5
+        # Each key counts once however many times it appears.
+        s = sum(_SCORE_WEIGHTS[k] for k in set(_SCORE_RE.findall(p.lower())))
         s -= p.count("/") * 2
         return s
 
@@ -82,7 +154,13 @@ def render_value(v: Any, state: dict[str, str]) -> Any:
     return v
 
 
+def _needs_render(s: str) -> bool:
+    return ":" in s or "{" in s
+
+
 def render_path(path: str, state: dict[str, str]) -> str:
+    if not _needs_render(path):
+        return path
     out = path.format_map(SafeMap(**state))
 
     def repl(match: re.Match[str]) -> str:
@@ -98,38 +176,62 @@ def render_path(path: str, state: dict[str, str]) -> str:
                     return str(state[k])
         return match.group(0)
 
-    return re.sub(r":([A-Za-z_][A-Za-z0-9_]*)", repl, out)
+    return _PATH_PARAM_RE.sub(repl, out)
 
 
 def has_unresolved_path_params(path: str) -> bool:
-    return bool(re.search(r":[A-Za-z_][A-Za-z0-9_]*", path))
+    return _PATH_PARAM_RE.search(path) is not None
+
+
+def find_keys(data: Any, keys: set[str]) -> dict[str, str]:
+    """
+    Single depth-first walk of `data` collecting the first non-empty value for each key in `keys`.
+    Visit order matches a recursive pre-order search; stops early once every key is found.
+    """
+    found: dict[str, str] = {}
+    stack = [data]
+    while stack and len(found) < len(keys):
+        node = stack.pop()
+        if isinstance(node, dict):
+            for k in keys & node.keys():
+                if k not in found and node[k] is not None and str(node[k]):
+                    found[k] = str(node[k])
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return found
 
 
 def find_by_key(data: Any, key: str) -> str:
-    if isinstance(data, dict):
-        if key in data and data[key] is not None:
-            return str(data[key])
-        for v in data.values():
-            found = find_by_key(v, key)
-            if found:
-                return found
-    if isinstance(data, list):
-        for item in data:
-            found = find_by_key(item, key)
-            if found:
-                return found
-    return ""
-
-
-def api_call(page, *, path: str, method: str = "GET", body: dict | None = None, token: str = "") -> dict:
-    return page.evaluate(
+    return find_keys(data, {key}).get(key, "")
+
+
+def api_call(
+    page,
+    *,
+    path: str,
+    method: str = "GET",
+    body: dict | None = None,
+    token: str = "",
+    reauth: Callable[[], str] | None = None,
+) -> dict:
+    """
+    Call app API using the authenticated browser context (cookies/session).
+    On 401 the cached auth is dropped; if `reauth` is given it is called for a fresh token and the call is retried once.
+    Returns: { ok, status, json, text }
+    """
+    res = page.evaluate(
         """async ({path, method, body, token}) => {
           const headers = { 'Content-Type': 'application/json' };
           if (token) headers['Authorization'] = 'Bearer ' + token;
+          const payload = body ? JSON.stringify(body) : undefined;
           const init = {
             method,
             headers,
-            body: body ? JSON.stringify(body) : undefined,
+            body: payload,
+            // keepalive bodies share a 64KB (bytes, not chars) quota in the Fetch spec; larger payloads go out
+            // as normal requests.
+            keepalive: !payload || new TextEncoder().encode(payload).length < 60000,
           };
           const r = await fetch(path, init);
           const t = await r.text();
@@ -139,6 +241,47 @@ def api_call(page, *, path: str, method: str = "GET", body: dict | None = None,
         }""",
         {"path": path, "method": method, "body": body, "token": token},
     )
+    if res.get("status") == 401:
+        invalidate_auth_state()
+        if reauth is not None:
+            return api_call(page, path=path, method=method, body=body, token=reauth())
+    return res
+
+
+def request_token(page, *, email: str, password: str) -> str:
+    """POST /api/auth/login from the page; returns the API token, or "" when the app uses cookie auth only."""
+    auth = api_call(page, path="/api/auth/login", method="POST", body={"email": email, "password": password})
+    auth_json = auth.get("json") if isinstance(auth.get("json"), dict) else {}
+    return str((auth_json or {}).get("token") or "")
+
+
+def api_call_many(page, calls: list[dict], token: str = "") -> list[dict]:
+    """
+    Issue independent calls concurrently in a single page.evaluate (one CDP round trip).
+    calls: [{ path, method }]
+    Returns results in the same order: [{ ok, status, json, text }], or { error } for a rejected fetch.
+    """
+    if not calls:
+        return []
+    return page.evaluate(
+        """async ({calls, token}) => {
+          const headers = { 'Content-Type': 'application/json' };
+          if (token) headers['Authorization'] = 'Bearer ' + token;
+          return Promise.all(calls.map(async (c) => {
+            try {
+              const r = await fetch(c.path, { method: c.method || 'GET', headers, keepalive: true });
+              const t = await r.text();
+              let j = null;
+              try { j = t ? JSON.parse(t) : null; } catch { j = null; }
+              return { ok: r.ok, status: r.status, json: j, text: t };
+            } catch (e) {
+              // A rejected fetch (network error, cross-origin redirect) is a failure, not a status.
+              return { error: String(e) };
+            }
+          }));
+        }""",
+        {"calls": calls, "token": token},
+    )
 
 
 def api_upload(
@@ -151,8 +294,10 @@ def api_upload(
     file_content: str = "",
     file_type: str = "text/csv",
     token: str = "",
+    reauth: Callable[[], str] | None = None,
 ) -> dict:
-    return page.evaluate(
+    """Multipart POST of one generated file plus form `fields`; 401 handling as in `api_call`."""
+    res = page.evaluate(
         """async ({path, fields, fileField, fileName, fileContent, fileType, token}) => {
           const blob = new Blob([fileContent], {type: fileType});
           const file = new File([blob], fileName, {type: fileType});
@@ -176,6 +321,91 @@ def api_upload(
             "token": token,
         },
     )
+    if res.get("status") == 401:
+        invalidate_auth_state()
+        if reauth is not None:
+            return api_upload(
+                page,
+                path=path,
+                fields=fields,
+                file_field=file_field,
+                file_name=file_name,
+                file_content=file_content,
+                file_type=file_type,
+                token=reauth(),
+            )
+    return res
+
+
+def api_call_conditional(
+    page, *, path: str, etag: str = "", token: str = "", reauth: Callable[[], str] | None = None
+) -> dict:
+    """
+    GET `path` with If-None-Match when `etag` is known. A 304 comes back with json/text unset.
+    401 handling as in `api_call`.
+    Returns: { ok, status, json, text, etag }
+    """
+    res = page.evaluate(
+        """async ({path, etag, token}) => {
+          const headers = {};
+          if (token) headers['Authorization'] = 'Bearer ' + token;
+          if (etag) headers['If-None-Match'] = etag;
+          // no-store keeps the browser cache from answering the revalidation on our behalf.
+          const r = await fetch(path, { method: 'GET', headers, cache: 'no-store', keepalive: true });
+          const tag = r.headers.get('ETag') || etag;
+          if (r.status === 304) return { ok: true, status: 304, json: null, text: '', etag: tag };
+          const t = await r.text();
+          let j = null;
+          try { j = t ? JSON.parse(t) : null; } catch { j = null; }
+          return { ok: r.ok, status: r.status, json: j, text: t, etag: tag };
+        }""",
+        {"path": path, "etag": etag, "token": token},
+    )
+    if res.get("status") == 401:
+        invalidate_auth_state()
+        if reauth is not None:
+            return api_call_conditional(page, path=path, etag=etag, token=reauth())
+    return res
+
+
+def poll_sse(page, *, path: str, target: str, status_field: str, fail_value: str, timeout_sec: float) -> dict | None:
+    """
+    Wait on an EventSource at `path` for a message whose `status_field` is `target` or `fail_value`.
+    Returns None if the stream cannot be opened, so the caller can fall back to GET polling.
+    """
+    res = page.evaluate(
+        """({path, target, statusField, failValue, timeoutMs}) => new Promise((resolve) => {
+          let opened = false;
+          let last = null;
+          const es = new EventSource(path, { withCredentials: true });
+          const done = (v) => { es.close(); clearTimeout(timer); resolve(v); };
+          const timer = setTimeout(() => done({ mode: 'timeout', data: last }), timeoutMs);
+          es.onopen = () => { opened = true; };
+          es.onerror = () => { if (!opened) done({ mode: 'unsupported', data: null }); };
+          es.onmessage = (ev) => {
+            let j = null;
+            try { j = JSON.parse(ev.data); } catch { return; }
+            if (!j || typeof j !== 'object') return;
+            last = j;
+            const st = String(j[statusField] ?? 'UNKNOWN');
+            if (st === target || (failValue && st === failValue)) done({ mode: 'event', data: j });
+          };
+        })""",
+        {
+            "path": path,
+            "target": target,
+            "statusField": status_field,
+            "failValue": fail_value,
+            "timeoutMs": int(max(0, timeout_sec) * 1000),
+        },
+    )
+    if not isinstance(res, dict) or res.get("mode") == "unsupported":
+        return None
+    data = res.get("data") if isinstance(res.get("data"), dict) else {}
+    last_status = str(data.get(status_field, "UNKNOWN"))
+    if res.get("mode") == "timeout":
+        return {"ok": False, "status": f"TIMEOUT (last: {last_status})", "data": data}
+    return {"ok": last_status == target, "status": last_status, "data": data}
 
 
 def poll_until(
@@ -186,28 +416,80 @@ def poll_until(
     status_field: str = "status",
     fail_value: str = "FAILED",
     timeout_sec: int = 30,
-    interval_sec: int = 2,
+    initial_interval_sec: float = 0.1,
+    max_interval_sec: float = 2.0,
+    poll_mode: str = "get",
     token: str = "",
+    reauth: Callable[[], str] | None = None,
 ) -> dict:
+    """
+    Poll `path` until `status_field` reaches `target` (or `fail_value`).
+    Starts with a short interval and backs off exponentially up to `max_interval_sec`,
+    never sleeping past the deadline.
+
+    poll_mode:
+    - "get"  (default) plain GET each iteration
+    - "etag" revalidate with If-None-Match; a 304 means "unchanged" and skips the JSON parse
+    - "sse"  wait on an EventSource stream; falls back to GET polling if the endpoint isn't a stream
+
+    A 401 drops the cached auth; with `reauth` the poll continues on the fresh token.
+    """
     deadline = time.time() + timeout_sec
+
+    def _refresh() -> str:
+        nonlocal token
+        token = reauth()
+        return token
+
+    refresh = _refresh if reauth is not None else None
+
+    if poll_mode == "sse":
+        streamed = poll_sse(
+            page, path=path, target=target, status_field=status_field, fail_value=fail_value, timeout_sec=timeout_sec
+        )
+        if streamed is not None:
+            return streamed
+
+    interval = max(0.1, initial_interval_sec)
+    etag = ""
     last_status = "UNKNOWN"
     last_data: dict = {}
-    while time.time() < deadline:
-        res = api_call(page, path=path, token=token)
-        data = res.get("json") or {}
-        if not isinstance(data, dict):
-            data = {}
-        last_status = str(data.get(status_field, "UNKNOWN"))
-        last_data = data
-        if last_status == target:
-            return {"ok": True, "status": last_status, "data": data}
-        if fail_value and last_status == fail_value:
-            return {"ok": False, "status": last_status, "data": data}
-        time.sleep(interval_sec)
+    while True:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            break
+        if poll_mode == "etag":
+            res = api_call_conditional(page, path=path, etag=etag, token=token, reauth=refresh)
+            etag = str(res.get("etag") or "")
+        else:
+            res = api_call(page, path=path, token=token, reauth=refresh)
+        if res.get("status") == 401:
+            return {"ok": False, "status": "UNAUTHORIZED", "data": {}}
+        if res.get("status") != 304:
+            data = res.get("json") or {}
+            if not isinstance(data, dict):
+                data = {}
+            last_status = str(data.get(status_field, "UNKNOWN"))
+            last_data = data
+            if last_status == target:
+                return {"ok": True, "status": last_status, "data": data}
+            if fail_value and last_status == fail_value:
+                return {"ok": False, "status": last_status, "data": data}
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            break
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 1.5, max_interval_sec)
     return {"ok": False, "status": f"TIMEOUT (last: {last_status})", "data": last_data}
 
 
-def run_plan_step(page, step: dict, state: dict[str, str], token: str) -> tuple[bool, str]:
+def run_plan_step(
+    page,
+    step: dict,
+    state: dict[str, str],
+    token: str,
+    reauth: Callable[[], str] | None = None,
+) -> tuple[bool, str]:
     kind = str(step.get("kind") or "api")
     method = str(step.get("method") or "GET").upper()
     path = render_path(str(step.get("path") or "/"), state)
@@ -226,6 +508,7 @@ def run_plan_step(page, step: dict, state: dict[str, str], token: str) -> tuple[
             file_content=file_content,
             file_type=str(step.get("file_type") or "text/csv"),
             token=token,
+            reauth=reauth,
         )
         status = int(res.get("status") or 0)
         ok = bool(res.get("ok"))
@@ -239,8 +522,11 @@ def run_plan_step(page, step: dict, state: dict[str, str], token: str) -> tuple[
             status_field=str(step.get("status_field") or "status"),
             fail_value=str(step.get("fail_value") or "FAILED"),
             timeout_sec=int(step.get("timeout_sec") or 30),
-            interval_sec=int(step.get("interval_sec") or 2),
+            initial_interval_sec=float(step.get("initial_interval_sec") or 0.1),
+            max_interval_sec=float(step.get("max_interval_sec") or step.get("interval_sec") or 2),
+            poll_mode=str(step.get("poll_mode") or "get").lower(),
             token=token,
+            reauth=reauth,
         )
         ok = bool(poll.get("ok"))
         note = str(poll.get("status"))
@@ -248,7 +534,7 @@ def run_plan_step(page, step: dict, state: dict[str, str], token: str) -> tuple[
     else:
         body = render_value(step.get("body"), state)
         body_dict = body if isinstance(body, dict) else None
-        res = api_call(page, path=path, method=method, body=body_dict, token=token)
+        res = api_call(page, path=path, method=method, body=body_dict, token=token, reauth=reauth)
         status = int(res.get("status") or 0)
         ok = bool(res.get("ok"))
         note = f"status={status}"
@@ -259,10 +545,9 @@ def run_plan_step(page, step: dict, state: dict[str, str], token: str) -> tuple[
         candidates = [save_as] if save_as else []
         candidates += [str(k) for k in (step.get("produced_keys") or [])]
         candidates += ["id", "datasetId", "jobId", "analysisId", "token"]
+        found = find_keys(payload, {k for k in candidates if k})
         for key in candidates:
-            if not key:
-                continue
-            value = find_by_key(payload, key)
+            value = found.get(key) if key else ""
             if value:
                 state[key] = value
                 if save_as and key != save_as and save_as not in state:
@@ -271,9 +556,11 @@ def run_plan_step(page, step: dict, state: dict[str, str], token: str) -> tuple[
     return ok, note
 
 
-def main() -> None:
-    load_dotenv(HERE / ".env")
-
+def run_use(page, context, run_dir: Path) -> dict:
+    """
+    Run the Use Test against an already-open page/context and write `run_dir/result.json`.
+    Returns: { run_id, result_json, summary }
+    """
     base_url = require_env("BASE_URL").rstrip("/")
     test_email = require_env("TEST_EMAIL")
     test_password = require_env("TEST_PASSWORD")
@@ -283,8 +570,6 @@ def main() -> None:
     pass_sel = os.getenv("PASSWORD_SELECTOR", "input[type='password']")
     submit_sel = os.getenv("SUBMIT_SELECTOR", "button[type='submit']")
 
-    slow_mo = int(os.getenv("SLOW_MO_MS", "60"))
-    headless = os.getenv("HEADLESS", "false").lower() in ("1", "true", "yes")
     mutating = os.getenv("MUTATING_TESTS", "false").lower() in ("1", "true", "yes")
 
     workflow_plan = read_workflow_plan()
@@ -295,44 +580,56 @@ def main() -> None:
     cleanup_plan = workflow_plan.get("cleanup") if isinstance(workflow_plan, dict) else []
     skipped_plan = workflow_plan.get("skipped") if isinstance(workflow_plan, dict) else []
 
-    run_dir, shots_dir = mk_run_dir(RUN_ROOT, "use_test")
+    shots_dir = run_dir / "screenshots"
+    shots_dir.mkdir(parents=True, exist_ok=True)
     downloads_dir = run_dir / "downloads"
     downloads_dir.mkdir(parents=True, exist_ok=True)
     steps: list[Step] = []
     downloads: list[str] = []
 
-    def log(name: str, ok: bool, note: str = "") -> None:
-        steps.append(Step(name=name, passed=ok, note=note, screenshot=shot(page, shots_dir, name), at=now_utc()))
+    def log(name: str, ok: bool, note: str = "", on_page=None) -> None:
+        screenshot = shot(on_page or page, shots_dir, name) if wants_shot(ok) else ""
+        steps.append(Step(name=name, passed=ok, note=note, screenshot=screenshot, at=now_utc()))
         print(("[PASS]" if ok else "[FAIL]"), name, "-", note)
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=headless, slow_mo=slow_mo)
-        context = browser.new_context(viewport={"width": 1600, "height": 1000}, accept_downloads=True)
-        page = context.new_page()
+    # Reuse the session from a previous run when possible; fall back to the login form.
+    logged_in = False
+    cached_state = load_auth_state(base_url, test_email)
+    if cached_state:
+        context.add_cookies(cached_state["cookies"])
+        page.goto(f"{base_url}/dashboard", wait_until="domcontentloaded", timeout=60000)
+        logged_in = page.url.startswith(base_url) and ("/login" not in page.url)
+        if logged_in:
+            log("Login", True, f"{page.url} (cached session)")
+        else:
+            invalidate_auth_state()
+            context.clear_cookies()
 
+    if not logged_in:
         page.goto(f"{base_url}{login_path}", wait_until="domcontentloaded", timeout=60000)
         page.locator(email_sel).first.fill(test_email)
         page.locator(pass_sel).first.fill(test_password)
         page.locator(submit_sel).first.click(force=True)
-        page.wait_for_timeout(1200)
+        try:
+            page.wait_for_url(lambda u: "/login" not in u, timeout=15000)
+        except Exception:
+            pass
         logged_in = page.url.startswith(base_url) and ("/login" not in page.url)
         log("Login", logged_in, page.url)
-        if not logged_in:
-            write_result(run_dir / "result.json", base_url=base_url, test_email=test_email, steps=steps, artifacts={})
-            context.close()
-            browser.close()
-            return
-
-        token = ""
+        if logged_in:
+            save_auth_state(context, base_url, test_email)
+    if not logged_in:
+        summary = write_result(run_dir / "result.json", base_url=base_url, test_email=test_email, steps=steps, artifacts={})
+        return {"run_id": run_dir.name, "result_json": str(run_dir / "result.json"), "summary": summary["summary"]}
+
+    cached_token = load_cached_token(base_url, test_email)
+    token = cached_token or ""
+    if cached_token is not None:
+        log("API token discovery", True, "token cached" if token else "cookie auth only (cached)")
+    else:
         try:
-            auth = api_call(
-                page,
-                path="/api/auth/login",
-                method="POST",
-                body={"email": test_email, "password": test_password},
-            )
-            auth_json = auth.get("json") if isinstance(auth.get("json"), dict) else {}
-            token = str((auth_json or {}).get("token") or "")
+            token = request_token(page, email=test_email, password=test_password)
+            save_cached_token(base_url, test_email, token)
             if token:
                 log("API token discovery", True, "token acquired")
             else:
@@ -340,121 +637,174 @@ def main() -> None:
         except Exception as exc:
             log("API token discovery", True, f"skip: {exc}")
 
-        if mutating:
-            suffix = str(int(time.time()))
-            state: dict[str, str] = {"ts": suffix}
+    def reauth() -> str:
+        nonlocal token
+        token = request_token(page, email=test_email, password=test_password)
+        save_cached_token(base_url, test_email, token)
+        return token
 
-            if isinstance(core_chain, list) and core_chain:
-                for i, step in enumerate(core_chain, start=1):
-                    if not isinstance(step, dict):
-                        continue
-                    name = str(step.get("name") or f"WF Step {i}")
-                    try:
-                        ok, note = run_plan_step(page, step, state, token)
-                        log(f"WF: {name}", ok, note)
-                    except Exception as exc:
-                        log(f"WF: {name}", False, str(exc))
-            else:
-                ws = api_call(page, path="/api/workstreams", method="POST", body={"name": f"USE WS {suffix}"}, token=token)
-                ws_id = find_by_key(ws.get("json"), "id")
-                if ws_id:
-                    state["workstreamId"] = ws_id
-                log("Create workstream (fallback)", bool(ws.get("ok")) and bool(ws_id), f"status={ws.get('status')} id={ws_id}")
-
-            if isinstance(branches, list):
-                for step in branches:
-                    if not isinstance(step, dict):
-                        continue
-                    name = str(step.get("name") or "Branch")
-                    try:
-                        ok, note = run_plan_step(page, step, state, token)
-                        log(f"WF Branch: {name}", ok, note)
-                    except Exception as exc:
-                        log(f"WF Branch: {name}", False, str(exc))
+    if mutating:
+        suffix = str(int(time.time()))
+        state: dict[str, str] = {"ts": suffix}
 
-            if not isinstance(utility_hits, list) or not utility_hits:
-                utility_hits = [{"method": "GET", "path": "/api/auth/me"}, {"method": "GET", "path": "/api/stats"}]
-            for item in utility_hits:
-                if not isinstance(item, dict):
+        if isinstance(core_chain, list) and core_chain:
+            for i, step in enumerate(core_chain, start=1):
+                if not isinstance(step, dict):
                     continue
-                method = str(item.get("method") or "GET").upper()
-                path = render_path(str(item.get("path") or "/api/health"), state)
-                if has_unresolved_path_params(path):
-                    log(f"Utility: {method} {item.get('path')}", True, f"skip unresolved params -> {path}")
+                name = str(step.get("name") or f"WF Step {i}")
+                try:
+                    ok, note = run_plan_step(page, step, state, token, reauth)
+                    log(f"WF: {name}", ok, note)
+                except Exception as exc:
+                    log(f"WF: {name}", False, str(exc))
+        else:
+            ws = api_call(page, path="/api/workstreams", method="POST", body={"name": f"USE WS {suffix}"}, token=token, reauth=reauth)
+            ws_id = find_by_key(ws.get("json"), "id")
+            if ws_id:
+                state["workstreamId"] = ws_id
+            log("Create workstream (fallback)", bool(ws.get("ok")) and bool(ws_id), f"status={ws.get('status')} id={ws_id}")
+
+        if isinstance(branches, list):
+            for step in branches:
+                if not isinstance(step, dict):
                     continue
+                name = str(step.get("name") or "Branch")
                 try:
-                    r = api_call(page, path=path, method=method, token=token)
-                    log(f"Utility: {method} {path}", int(r.get("status", 500)) < 500, f"status={r.get('status')}")
+                    ok, note = run_plan_step(page, step, state, token, reauth)
+                    log(f"WF Branch: {name}", ok, note)
                 except Exception as exc:
-                    log(f"Utility: {method} {path}", False, str(exc))
-
-            if isinstance(cleanup_plan, list):
-                for item in cleanup_plan:
-                    if not isinstance(item, dict):
-                        continue
-                    key = str(item.get("state_key") or "")
-                    if not key or key not in state:
-                        continue
-                    path = render_path(str(item.get("path") or ""), state)
-                    if not path:
-                        continue
-                    if has_unresolved_path_params(path):
-                        log(f"WF Cleanup: {key}", True, f"skip unresolved params -> {path}")
-                        continue
-                    method = str(item.get("method") or "DELETE").upper()
-                    try:
-                        time.sleep(1)
-                        r = api_call(page, path=path, method=method, token=token)
-                        ok = bool(r.get("ok")) or int(r.get("status") or 0) == 404
-                        note = f"status={r.get('status')}"
-                        if not ok and bool(item.get("non_critical")):
-                            note += " (non-critical)"
-                        log(f"WF Cleanup: {key}", ok or bool(item.get("non_critical")), note)
-                    except Exception as exc:
-                        if bool(item.get("non_critical")):
-                            log(f"WF Cleanup: {key}", True, f"non-critical: {exc}")
-                        else:
-                            log(f"WF Cleanup: {key}", False, str(exc))
-
-            if isinstance(skipped_plan, list):
-                for item in skipped_plan:
-                    if not isinstance(item, dict):
-                        continue
-                    method = str(item.get("method") or "GET").upper()
-                    raw_path = str(item.get("path") or "")
-                    reason = str(item.get("reason") or "unclassified")
-                    if raw_path:
-                        log(f"Audit Skipped: {method} {raw_path}", True, reason)
-
-        use_paths = prioritize_use_paths(read_paths(), limit=8)
-        for path in use_paths:
+                    log(f"WF Branch: {name}", False, str(exc))
+
+        if not isinstance(utility_hits, list) or not utility_hits:
+            utility_hits = [{"method": "GET", "path": "/api/auth/me"}, {"method": "GET", "path": "/api/stats"}]
+        utility_calls: list[tuple[str, str, str]] = []
+        for item in utility_hits:
+            if not isinstance(item, dict):
+                continue
+            method = str(item.get("method") or "GET").upper()
+            path = render_path(str(item.get("path") or "/api/health"), state)
+            utility_calls.append((method, path, str(item.get("path"))))
+
+        # Independent GETs go out together in one evaluate; anything else stays sequential.
+        batch = [{"path": path, "method": method} for method, path, _ in utility_calls if method == "GET" and not has_unresolved_path_params(path)]
+        batched: dict[str, dict] = {}
+        try:
+            for call, r in zip(batch, api_call_many(page, batch, token=token)):
+                batched[call["path"]] = r
+        except Exception as exc:
+            for call in batch:
+                batched[call["path"]] = {"error": str(exc)}
+
+        for method, path, raw_path in utility_calls:
+            if has_unresolved_path_params(path):
+                log(f"Utility: {method} {raw_path}", True, f"skip unresolved params -> {path}")
+                continue
             try:
-                page.goto(f"{base_url}{path}", wait_until="domcontentloaded", timeout=60000)
-                page.wait_for_timeout(600)
-                log(f"Open {path}", True, page.url)
+                r = batched.get(path) if method == "GET" else None
+                if r is not None and r.get("status") == 401:
+                    # Stale token in the batch: redo the call singly so api_call drops the cache and reauths.
+                    r = None
+                if r is None:
+                    r = api_call(page, path=path, method=method, token=token, reauth=reauth)
+                if "error" in r:
+                    raise RuntimeError(r["error"])
+                log(f"Utility: {method} {path}", int(r.get("status", 500)) < 500, f"status={r.get('status')}")
             except Exception as exc:
-                log(f"Open {path}", False, str(exc))
-                continue
+                log(f"Utility: {method} {path}", False, str(exc))
 
-            btn = page.locator(
-                "button:has-text('Export'), button:has-text('Download'), a:has-text('Export'), a:has-text('Download')"
-            ).first
-            if btn.count() > 0:
+        if isinstance(cleanup_plan, list):
+            for item in cleanup_plan:
+                if not isinstance(item, dict):
+                    continue
+                key = str(item.get("state_key") or "")
+                if not key or key not in state:
+                    continue
+                path = render_path(str(item.get("path") or ""), state)
+                if not path:
+                    continue
+                if has_unresolved_path_params(path):
+                    log(f"WF Cleanup: {key}", True, f"skip unresolved params -> {path}")
+                    continue
+                method = str(item.get("method") or "DELETE").upper()
                 try:
-                    with page.expect_download(timeout=30000) as dl_info:
-                        btn.click(force=True)
-                    dl = dl_info.value
-                    out = downloads_dir / f"{path.strip('/').replace('/', '_') or 'root'}_{int(time.time())}"
-                    dl.save_as(str(out))
-                    downloads.append(str(out))
-                    log(f"Download on {path}", True, str(out))
+                    time.sleep(1)
+                    r = api_call(page, path=path, method=method, token=token, reauth=reauth)
+                    ok = bool(r.get("ok")) or int(r.get("status") or 0) == 404
+                    note = f"status={r.get('status')}"
+                    if not ok and bool(item.get("non_critical")):
+                        note += " (non-critical)"
+                    log(f"WF Cleanup: {key}", ok or bool(item.get("non_critical")), note)
                 except Exception as exc:
-                    log(f"Download on {path}", False, str(exc))
+                    if bool(item.get("non_critical")):
+                        log(f"WF Cleanup: {key}", True, f"non-critical: {exc}")
+                    else:
+                        log(f"WF Cleanup: {key}", False, str(exc))
 
-        context.close()
-        browser.close()
+        if isinstance(skipped_plan, list):
+            for item in skipped_plan:
+                if not isinstance(item, dict):
+                    continue
+                method = str(item.get("method") or "GET").upper()
+                raw_path = str(item.get("path") or "")
+                reason = str(item.get("reason") or "unclassified")
+                if raw_path:
+                    log(f"Audit Skipped: {method} {raw_path}", True, reason)
+
+    use_paths = prioritize_use_paths(read_paths(), limit=8)
+    # Sync Playwright can't run gotos concurrently, but navigations started with wait_until="commit"
+    # keep loading in the background, so a small set of tabs overlaps the page loads.
+    width = max(1, int(os.getenv("USE_PARALLEL_PAGES", "4")))
+    toolbar_sel = os.getenv("USE_TOOLBAR_SELECTOR", "").strip()
+    tabs = [page] + [context.new_page() for _ in range(min(width, len(use_paths)) - 1)]
+    # Per-run sequence keeps download names unique (a seconds timestamp could collide).
+    dl_counter = itertools.count()
+    try:
+        for i in range(0, len(use_paths), len(tabs)):
+            started: list[tuple[Any, str, Exception | None]] = []
+            for tab, path in zip(tabs, use_paths[i : i + len(tabs)]):
+                try:
+                    tab.goto(f"{base_url}{path}", wait_until="commit", timeout=60000)
+                    started.append((tab, path, None))
+                except Exception as exc:
+                    started.append((tab, path, exc))
 
-    write_result(
+            for tab, path, err in started:
+                if err is None:
+                    try:
+                        tab.wait_for_load_state("domcontentloaded", timeout=60000)
+                    except Exception as exc:
+                        err = exc
+                if err is not None:
+                    log(f"Open {path}", False, str(err), tab)
+                    continue
+                log(f"Open {path}", True, tab.url, tab)
+
+                btn = tab.locator(
+                    "button:has-text('Export'), button:has-text('Download'), a:has-text('Export'), a:has-text('Download')"
+                ).first
+                # Checked straight after DCL; apps whose toolbar renders late set USE_TOOLBAR_SELECTOR
+                # so only then is there a short wait for it (never a flat wait on pages without a button).
+                if btn.count() == 0 and toolbar_sel:
+                    try:
+                        tab.wait_for_selector(toolbar_sel, state="attached", timeout=1500)
+                    except Exception:
+                        pass
+                if btn.count() > 0:
+                    try:
+                        with tab.expect_download(timeout=30000) as dl_info:
+                            btn.click(force=True)
+                        dl = dl_info.value
+                        out = downloads_dir / f"{path.strip('/').replace('/', '_') or 'root'}_{next(dl_counter):04d}"
+                        dl.save_as(str(out))
+                        downloads.append(str(out))
+                        log(f"Download on {path}", True, str(out), tab)
+                    except Exception as exc:
+                        log(f"Download on {path}", False, str(exc), tab)
+    finally:
+        for tab in tabs[1:]:
+            tab.close()
+
+    summary = write_result(
         run_dir / "result.json",
         base_url=base_url,
         test_email=test_email,
@@ -462,6 +812,25 @@ def main() -> None:
         artifacts={"downloads": downloads, "workflow_plan_loaded": bool(workflow_plan)},
     )
     print(f"Result file: {run_dir / 'result.json'}")
+    return {"run_id": run_dir.name, "result_json": str(run_dir / "result.json"), "summary": summary["summary"]}
+
+
+def main() -> None:
+    load_dotenv(HERE / ".env")
+
+    slow_mo = int(os.getenv("SLOW_MO_MS", "60"))
+    headless = os.getenv("HEADLESS", "false").lower() in ("1", "true", "yes")
+
+    run_dir, _ = mk_run_dir(RUN_ROOT, "use_test")
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=headless, slow_mo=slow_mo)
+        context = browser.new_context(viewport={"width": 1600, "height": 1000}, accept_downloads=True)
+        page = context.new_page()
+        try:
+            run_use(page, context, run_dir)
+        finally:
+            context.close()
+            browser.close()
 
 
 if __name__ == "__main__":
@@ -3,6 +3,10 @@ Volume Test runner: repeatedly execute Smoke Test + Use Test on a cadence.
 
 Design goals:
 - Works with the bundled run_smoke_test.py + run_use_test.py (no app-specific logic here)
+- Launches Chromium once per suite and runs smoke + use in-process, concurrently, each cycle
+  (--serial to run them one after another)
+- --subprocess: same, but each suite lives in a long-lived worker.py process (isolated, warm imports)
+- --fresh-process: spawn a new interpreter per suite per cycle (slowest, fully isolated)
 - Writes a JSONL index so failures are traceable
 - Stops on first failure by default
 
@@ -19,11 +23,18 @@ import os
 import subprocess
 import sys
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import Callable
 
-from common import load_dotenv, require_env
+from playwright.sync_api import sync_playwright
+
+from common import dumps_bytes, load_dotenv, mk_run_dir, require_env
+from run_smoke_test import run_smoke
+from run_use_test import run_use
 
 
 HERE = Path(__file__).resolve().parent
@@ -46,12 +57,8 @@ class TestRun:
 def newest_result(prefix: str) -> Path | None:
     if not RUNS_ROOT.exists():
         return None
-    candidates = sorted(
-        [p for p in RUNS_ROOT.glob(f"{prefix}_*/result.json") if p.is_file()],
-        key=lambda p: p.stat().st_mtime,
-        reverse=True,
-    )
-    return candidates[0] if candidates else None
+    candidates = [p for p in RUNS_ROOT.glob(f"{prefix}_*/result.json") if p.is_file()]
+    return max(candidates, key=lambda p: p.stat().st_mtime) if candidates else None
 
 
 def parse_ok(result_path: Path) -> tuple[bool, str]:
@@ -80,12 +87,120 @@ def run_script(script: Path, *, prefix: str, env: dict[str, str]) -> TestRun:
     return TestRun(script.name, ok and proc.returncode == 0, str(result), result.parent.name, dur)
 
 
+def run_inprocess(name: str, fn: Callable, page, context, *, prefix: str) -> TestRun:
+    start = time.time()
+    run_dir, _ = mk_run_dir(RUNS_ROOT, prefix)
+    try:
+        res = fn(page, context, run_dir)
+    except Exception as exc:
+        print(f"[volume] {name} crashed: {exc}")
+        return TestRun(name, False, "", run_dir.name, time.time() - start)
+    dur = time.time() - start
+
+    result = Path(res.get("result_json") or "")
+    if not result.is_file():
+        return TestRun(name, False, "", run_dir.name, dur)
+
+    ok, _ = parse_ok(result)
+    return TestRun(name, ok, str(result), run_dir.name, dur)
+
+
+class BrowserWorker:
+    """
+    Owns one Chromium browser/context on a dedicated thread.
+    The sync Playwright API is thread-affine, so every call for this browser is funnelled through `_ex`.
+    """
+
+    def __init__(self, *, headless: bool, slow_mo: int) -> None:
+        self._ex = ThreadPoolExecutor(max_workers=1)
+        self._ex.submit(self._start, headless, slow_mo).result()
+
+    def _start(self, headless: bool, slow_mo: int) -> None:
+        self._pw = sync_playwright().start()
+        self._browser = self._pw.chromium.launch(headless=headless, slow_mo=slow_mo)
+        self._context = self._browser.new_context(viewport={"width": 1600, "height": 1000}, accept_downloads=True)
+        self._page = self._context.new_page()
+
+    def _run(self, name: str, fn: Callable, prefix: str) -> TestRun:
+        # Each cycle starts from a logged-out context.
+        self._context.clear_cookies()
+        return run_inprocess(name, fn, self._page, self._context, prefix=prefix)
+
+    def submit(self, name: str, fn: Callable, *, prefix: str) -> Future:
+        return self._ex.submit(self._run, name, fn, prefix)
+
+    def _stop(self) -> None:
+        self._context.close()
+        self._browser.close()
+        self._pw.stop()
+
+    def close(self) -> None:
+        try:
+            self._ex.submit(self._stop).result()
+        finally:
+            self._ex.shutdown(wait=True)
+
+
+class ProcessWorker:
+    """
+    Drives one long-lived worker.py process; same submit() shape as BrowserWorker.
+    Interpreter start-up, imports and browser launch are paid once per volume run instead of per cycle.
+    """
+
+    def __init__(self, *, env: dict[str, str]) -> None:
+        self._ex = ThreadPoolExecutor(max_workers=1)
+        self._proc = subprocess.Popen(
+            [sys.executable, "-u", str(HERE / "worker.py")],
+            cwd=str(HERE),
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+
+    def _run(self, name: str, prefix: str) -> TestRun:
+        start = time.time()
+        try:
+            self._proc.stdin.write(json.dumps({"prefix": prefix}) + "\n")
+            self._proc.stdin.flush()
+            line = self._proc.stdout.readline()
+        except (BrokenPipeError, OSError) as exc:
+            line = ""
+            print(f"[volume] {name} worker unavailable: {exc}")
+        dur = time.time() - start
+
+        reply = json.loads(line) if line.strip() else {"error": f"worker exited (code={self._proc.poll()})"}
+        result = Path(reply.get("result_json") or "")
+        if reply.get("error") or not result.is_file():
+            print(f"[volume] {name} failed: {reply.get('error') or 'no result.json'}")
+            return TestRun(name, False, "", str(reply.get("run_id") or ""), dur)
+
+        ok, _ = parse_ok(result)
+        return TestRun(name, ok, str(result), result.parent.name, dur)
+
+    def submit(self, name: str, fn: Callable, *, prefix: str) -> Future:
+        return self._ex.submit(self._run, name, prefix)
+
+    def close(self) -> None:
+        try:
+            if self._proc.stdin:
+                self._proc.stdin.close()
+            self._proc.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+        finally:
+            self._ex.shutdown(wait=True)
+
+
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--iterations", type=int, default=60)
     ap.add_argument("--delay-seconds", type=int, default=60)
     ap.add_argument("--headed", action="store_true", help="Run with a visible browser (sets HEADLESS=false)")
     ap.add_argument("--continue-on-fail", action="store_true", help="Keep going after failures (not recommended)")
+    ap.add_argument("--subprocess", action="store_true", help="Run each suite in a long-lived worker process")
+    ap.add_argument("--fresh-process", action="store_true", help="Run each suite in a fresh Python process every cycle (slowest)")
+    ap.add_argument("--serial", action="store_true", help="Run smoke then use sequentially instead of concurrently")
     args = ap.parse_args()
 
     load_dotenv(HERE / ".env")
@@ -118,17 +233,49 @@ def main() -> None:
     print(f"[volume] iterations={args.iterations} delay_seconds={args.delay_seconds} headless={env.get('HEADLESS')}")
     print(f"[volume] index={index_path}")
 
+    with ExitStack() as stack:
+        workers: dict[str, BrowserWorker | ProcessWorker] = {}
+        pool = None
+        if args.fresh_process:
+            pool = ThreadPoolExecutor(max_workers=2)
+            stack.callback(pool.shutdown, wait=True)
+        else:
+            # One browser per suite for the whole run, so smoke and use can overlap.
+            headless = env.get("HEADLESS", "true").lower() in ("1", "true", "yes")
+            slow_mo = int(env.get("SLOW_MO_MS") or 0)
+            for prefix in ("smoke_test", "use_test"):
+                if args.subprocess:
+                    workers[prefix] = ProcessWorker(env=env)
+                else:
+                    workers[prefix] = BrowserWorker(headless=headless, slow_mo=slow_mo)
+                stack.callback(workers[prefix].close)
+
+        def run_suite(script: Path, fn: Callable, prefix: str) -> Future:
+            if pool is not None:
+                return pool.submit(run_script, script, prefix=prefix, env=env)
+            return workers[prefix].submit(script.name, fn, prefix=prefix)
+
+        # Line-buffered so every record hits disk as it is written.
+        index_fh = stack.enter_context(index_path.open("a", encoding="utf-8", buffering=1))
+        run_volume(args, smoke=smoke, use=use, run_suite=run_suite, index_path=index_path, index_fh=index_fh)
+
+
+def run_volume(args, *, smoke: Path, use: Path, run_suite: Callable[..., Future], index_path: Path, index_fh) -> None:
     for n in range(1, args.iterations + 1):
         cycle_start = now_utc()
         print(f"\\n[cycle {n}/{args.iterations}] start={cycle_start}")
 
-        smoke_run = run_script(smoke, prefix="smoke_test", env=env)
+        smoke_future = run_suite(smoke, run_smoke, "smoke_test")
+        if args.serial:
+            smoke_future.result()
+        use_future = run_suite(use, run_use, "use_test")
+        smoke_run, use_run = smoke_future.result(), use_future.result()
+
         smoke_ok, smoke_ratio = (False, "n/a")
         if smoke_run.result_json:
             smoke_ok, smoke_ratio = parse_ok(Path(smoke_run.result_json))
         print(f"[cycle {n}] smoke ok={smoke_run.ok} ratio={smoke_ratio} run={smoke_run.run_id} dur={smoke_run.duration_sec:.1f}s")
 
-        use_run = run_script(use, prefix="use_test", env=env)
         use_ok, use_ratio = (False, "n/a")
         if use_run.result_json:
             use_ok, use_ratio = parse_ok(Path(use_run.result_json))
@@ -152,8 +299,7 @@ def main() -> None:
                 "duration_sec": round(use_run.duration_sec, 2),
             },
         }
-        with index_path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(record) + "\\n")
+        index_fh.write(dumps_bytes(record).decode("utf-8") + "\n")
 
         if not (smoke_run.ok and use_run.ok) and not args.continue_on_fail:
             print(f"[cycle {n}] FAIL: stopping. See index: {index_path}")
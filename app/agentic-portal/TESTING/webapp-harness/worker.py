@@ -0,0 +1,69 @@
+"""
+Long-lived suite worker used by `run_volume_test.py --subprocess`.
+
+Keeps one interpreter, one set of imports and one Chromium browser alive for the whole volume run,
+while still isolating the suites from the runner process.
+
+Protocol (one JSON object per line):
+  stdin:  {"prefix": "smoke_test" | "use_test"}
+  stdout: {"run_id", "result_json", "summary"} or {"error": "..."}
+
+Suite output is redirected to stderr so stdout only carries protocol lines.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from playwright.sync_api import sync_playwright
+
+from common import load_dotenv, mk_run_dir
+from run_smoke_test import run_smoke
+from run_use_test import run_use
+
+
+HERE = Path(__file__).resolve().parent
+RUN_ROOT = HERE / "runs"
+
+SUITES = {"smoke_test": run_smoke, "use_test": run_use}
+
+
+def main() -> None:
+    load_dotenv(HERE / ".env")
+
+    slow_mo = int(os.getenv("SLOW_MO_MS", "0"))
+    headless = os.getenv("HEADLESS", "true").lower() in ("1", "true", "yes")
+
+    out = sys.stdout
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=headless, slow_mo=slow_mo)
+        context = browser.new_context(viewport={"width": 1600, "height": 1000}, accept_downloads=True)
+        page = context.new_page()
+        try:
+            for raw in sys.stdin:
+                if not raw.strip():
+                    continue
+                try:
+                    cmd = json.loads(raw)
+                    prefix = str(cmd.get("prefix") or "")
+                    fn = SUITES[prefix]
+                    run_dir, _ = mk_run_dir(RUN_ROOT, prefix)
+                    # Each cycle starts from a logged-out context.
+                    context.clear_cookies()
+                    with redirect_stdout(sys.stderr):
+                        reply = fn(page, context, run_dir)
+                except Exception as exc:
+                    reply = {"error": str(exc)}
+                out.write(json.dumps(reply) + "\n")
+                out.flush()
+        finally:
+            context.close()
+            browser.close()
+
+
+if __name__ == "__main__":
+    main()
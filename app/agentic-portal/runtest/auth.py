@@ -0,0 +1,104 @@
+"""
+API login + storage_state cache, so tests can skip rendering the login page.
+
+- POSTs credentials to AUTH_API (default /api/auth/login) with a Playwright APIRequestContext
+  and keeps the resulting cookies as a storage_state dict.
+- Caches it under AUTH_CACHE_DIR (default ~/.cache/agenticportal), one file per base URL + email hash,
+  readable by the current user only (0600).
+- A cached state is reused for up to 30 minutes, and only while /api/auth/me still accepts it;
+  a 401 (or any failure) triggers a fresh API login.
+
+Callers should fall back to the UI login when `get_storage_state` returns {}, and `save_state` the
+session it produces so later runs skip the form.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from playwright.sync_api import Playwright
+
+
+MAX_AGE_SEC = 30 * 60
+
+
+def _cache_path(base_url: str, email: str) -> Path:
+    root = Path(os.getenv("AUTH_CACHE_DIR", "~/.cache/agenticportal")).expanduser()
+    key = hashlib.sha256(f"{base_url}|{email.lower()}".encode("utf-8")).hexdigest()[:16]
+    return root / f"auth_{key}.json"
+
+
+def _load_fresh(path: Path) -> dict:
+    try:
+        if time.time() - path.stat().st_mtime > MAX_AGE_SEC:
+            return {}
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    return state if isinstance(state, dict) and state.get("cookies") else {}
+
+
+def _write_private(path: Path, text: str) -> None:
+    """Write `text` readable by the current user only: the file holds live session cookies."""
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        fh.write(text)
+    # O_CREAT's mode only applies to new files; also tighten a cache written by an older version.
+    os.chmod(path, 0o600)
+
+
+def _session_ok(p: Playwright, base_url: str, state: dict) -> bool:
+    ctx = p.request.new_context(base_url=base_url, storage_state=state)
+    try:
+        return ctx.get("/api/auth/me").ok
+    finally:
+        ctx.dispose()
+
+
+def _api_login(p: Playwright, base_url: str, email: str, password: str) -> dict:
+    ctx = p.request.new_context(base_url=base_url)
+    try:
+        resp = ctx.post(os.getenv("AUTH_API", "/api/auth/login"), data={"email": email, "password": password})
+        if not resp.ok:
+            return {}
+        state = ctx.storage_state()
+    finally:
+        ctx.dispose()
+    return state if state.get("cookies") else {}
+
+
+def cached_state(base_url: str, email: str) -> dict:
+    """The cached storage_state if it is still within MAX_AGE_SEC (not revalidated), else {}."""
+    return _load_fresh(_cache_path(base_url, email))
+
+
+def save_state(base_url: str, email: str, state: dict) -> None:
+    """Cache a storage_state obtained some other way (e.g. the UI login), so the next run can reuse it."""
+    if state.get("cookies"):
+        _write_private(_cache_path(base_url, email), json.dumps(state))
+
+
+def invalidate(base_url: str, email: str) -> None:
+    _cache_path(base_url, email).unlink(missing_ok=True)
+
+
+def get_storage_state(p: Playwright, base_url: str, email: str, password: str) -> dict:
+    """
+    Return a logged-in storage_state for `email` on `base_url` (cached when still valid), or {} on failure.
+    """
+    path = _cache_path(base_url, email)
+    state = _load_fresh(path)
+    if state and _session_ok(p, base_url, state):
+        return state
+
+    state = _api_login(p, base_url, email, password)
+    if state:
+        _write_private(path, json.dumps(state))
+    else:
+        path.unlink(missing_ok=True)
+    return state
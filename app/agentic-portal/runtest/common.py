@@ -1,13 +1,25 @@
 from __future__ import annotations
 
+import itertools
 import json
 import os
+import queue
+import re
+import threading
 import time
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import urlparse
 
-from playwright.sync_api import Page
+from playwright.sync_api import BrowserContext, Page, Request, Response, Route
+
+from auth import cached_state, get_storage_state, invalidate as invalidate_auth, save_state as save_auth_state
+
+try:
+    import orjson  # optional: faster steps/result serialization
+except ImportError:
+    orjson = None
 
 
 def load_dotenv(dotenv_path: Path) -> None:
@@ -30,6 +42,14 @@ def load_dotenv(dotenv_path: Path) -> None:
             os.environ[k] = v
 
 
+def dumps_bytes(obj, *, indent: bool = False) -> bytes:
+    """JSON-encode `obj` (dataclasses included) to UTF-8 bytes, using orjson when it is installed."""
+    if orjson is not None:
+        option = orjson.OPT_NAIVE_UTC | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None, default=asdict).encode("utf-8")
+
+
 def now_utc() -> str:
     return datetime.utcnow().isoformat() + "Z"
 
@@ -47,13 +67,225 @@ def safe_filename(label: str) -> str:
     return safe[:120] if safe else "step"
 
 
+# Screenshots are captured as bytes on the caller's thread and written to disk by one background thread.
+# SHOT_FMT=png restores full-page PNGs (default: viewport JPEG q60); SHOT_EVERY_N=3 keeps every 3rd shot.
+_shot_queue: queue.Queue[tuple[Path, bytes]] = queue.Queue()
+_shot_counter = itertools.count()
+_drain_lock = threading.Lock()
+_drain_thread: threading.Thread | None = None
+
+
+def _drain() -> None:
+    while True:
+        path, data = _shot_queue.get()
+        try:
+            path.write_bytes(data)
+        except Exception as exc:
+            print(f"[shot] write failed: {path}: {exc}")
+        finally:
+            _shot_queue.task_done()
+
+
+def _ensure_drain() -> None:
+    global _drain_thread
+    with _drain_lock:
+        if _drain_thread is None:
+            _drain_thread = threading.Thread(target=_drain, name="shot-drain", daemon=True)
+            _drain_thread.start()
+
+
+def _shot_target(folder: Path, label: str) -> tuple[Path, dict]:
+    stem = f"{safe_filename(label)}_{int(time.time() * 1000)}"
+    if os.getenv("SHOT_FMT", "jpeg").strip().lower() == "png":
+        return folder / f"{stem}.png", {"full_page": True}
+    return folder / f"{stem}.jpg", {"type": "jpeg", "quality": 60, "full_page": False}
+
+
+def _shot_due() -> bool:
+    every_n = max(1, int(os.getenv("SHOT_EVERY_N", "1")))
+    return next(_shot_counter) % every_n == 0
+
+
+def _enqueue_shot(path: Path, data: bytes) -> str:
+    _ensure_drain()
+    _shot_queue.put((path, data))
+    return str(path)
+
+
+def shot_bytes(page: Page, folder: Path, label: str) -> tuple[Path, bytes]:
+    path, kwargs = _shot_target(folder, label)
+    return path, page.screenshot(**kwargs)
+
+
 def shot(page: Page, folder: Path, label: str) -> str:
-    out = folder / f"{safe_filename(label)}_{int(time.time() * 1000)}.png"
-    page.screenshot(path=str(out), full_page=True)
-    return str(out)
+    if not _shot_due():
+        return ""
+    return _enqueue_shot(*shot_bytes(page, folder, label))
+
+
+async def shot_async(page, folder: Path, label: str) -> str:
+    """`shot` for async_playwright pages; the file write still goes through the background writer."""
+    if not _shot_due():
+        return ""
+    path, kwargs = _shot_target(folder, label)
+    return _enqueue_shot(path, await page.screenshot(**kwargs))
+
+
+def flush_shots() -> None:
+    """Block until every queued screenshot has been written."""
+    _shot_queue.join()
+
+
+# Client-side navigation for SPA_PUSHSTATE mode: prefer the framework router (Next exposes
+# window.next.router), else pushState + popstate for routers that listen to history.
+_SPA_DETECT_JS = "() => !!(window.next || window.__NEXT_DATA__ || window.__NUXT__ || window.React)"
+_SPA_PUSH_JS = """(p) => {
+  const r = window.next && window.next.router;
+  if (r && typeof r.push === 'function') { r.push(p); return; }
+  history.pushState({}, '', p);
+  dispatchEvent(new PopStateEvent('popstate', { state: {} }));
+}"""
+
+
+def detect_spa(page: Page) -> bool:
+    """True when SPA_PUSHSTATE=true and the loaded page looks like a client-routed app."""
+    if os.getenv("SPA_PUSHSTATE", "false").lower() not in ("1", "true", "yes"):
+        return False
+    try:
+        return bool(page.evaluate(_SPA_DETECT_JS))
+    except Exception:
+        return False
+
+
+def start_visit(
+    page: Page, base_url: str, path: str, *, spa: bool = False, timeout_ms: int = 15000
+) -> tuple[Response | None, str | None]:
+    """
+    Start navigating `page` to `path` and return (response, from_path) without waiting for the DOM.
+    With `spa` and the app already loaded in `page`, routes client-side (no document load, no response) and
+    `from_path` is the pathname it left; otherwise goto returns once the response commits and `from_path`
+    is None. Finish with `settle_visit`.
+    """
+    if spa and page.url.startswith(base_url):
+        from_path = page.evaluate("() => location.pathname")
+        page.evaluate(_SPA_PUSH_JS, path)
+        return None, from_path
+    return page.goto(f"{base_url}{path}", wait_until="commit", timeout=timeout_ms), None
+
+
+def ms_left(started: float, budget_ms: int) -> int:
+    """What is left of `budget_ms` since `started` (a time.monotonic() stamp); at least 1, as 0 means "no timeout"."""
+    return max(1, budget_ms - int((time.monotonic() - started) * 1000))
+
+
+def wait_dom_ready(page: Page, timeout_ms: int) -> None:
+    """
+    Wait for a committed navigation to reach DOMContentLoaded, so probes see a parsed document.
+    Raises on timeout: a visit that never gets a DOM fails rather than being probed against an empty body.
+    """
+    page.wait_for_load_state("domcontentloaded", timeout=timeout_ms)
+
+
+async def wait_dom_ready_async(page, timeout_ms: int) -> None:
+    """`wait_dom_ready` for async_playwright pages."""
+    await page.wait_for_load_state("domcontentloaded", timeout=timeout_ms)
+
+
+def settle_visit(
+    page: Page, path: str, *, from_path: str | None, timeout_ms: int = 15000, started: float | None = None
+) -> None:
+    """
+    Wait for the navigation begun by `start_visit` to be ready for assertions.
+    `timeout_ms` is the whole visit budget; pass `started` (time.monotonic() before `start_visit`) so the
+    waits here only get what the commit left of it.
+    """
+    if started is None:
+        started = time.monotonic()
+    if from_path is not None:
+        # A client-side route change never resets the document's load state, so wait for the router to
+        # leave `from_path` (Next only updates the URL once the new route has committed); until then the DOM
+        # still belongs to the previous route. Like a goto, the route may land somewhere other than `path`
+        # (a redirect, a normalised trailing slash): the caller reports the final URL.
+        # SPA_READY_SELECTOR optionally names a per-app marker to wait for as well.
+        page.wait_for_function(
+            "([prev, p]) => location.pathname !== prev || location.pathname === p",
+            arg=[from_path, urlparse(path).path or "/"],
+            timeout=ms_left(started, timeout_ms),
+        )
+        ready_sel = os.getenv("SPA_READY_SELECTOR", "").strip()
+        if ready_sel:
+            page.wait_for_selector(ready_sel, state="attached", timeout=ms_left(started, timeout_ms))
+        try:
+            page.wait_for_load_state("networkidle", timeout=3000)
+        except Exception:
+            pass
+        return
+    wait_dom_ready(page, ms_left(started, timeout_ms))
+
+
+def visit(page: Page, base_url: str, path: str, *, spa: bool = False, timeout_ms: int = 15000) -> Response | None:
+    """`start_visit` + `settle_visit` for one page; returns the document response (None when routed client-side)."""
+    started = time.monotonic()
+    resp, from_path = start_visit(page, base_url, path, spa=spa, timeout_ms=timeout_ms)
+    settle_visit(page, path, from_path=from_path, timeout_ms=timeout_ms, started=started)
+    return resp
+
+
+# Third-party hosts that only add weight to page loads (analytics, tag managers, error reporting, chat widgets).
+BLOCKED_HOSTS = re.compile(
+    r"(^|\.)(googletagmanager\.com|google-analytics\.com|doubleclick\.net|segment\.(io|com)|sentry\.io"
+    r"|hotjar\.com|intercom\.io|fullstory\.com|mixpanel\.com|clarity\.ms)$",
+    re.I,
+)
+
 
+def _heavy_filter():
+    """Return a predicate for requests to abort, or None when BLOCK_HEAVY is off."""
+    if os.getenv("BLOCK_HEAVY", "true").lower() not in ("1", "true", "yes"):
+        return None
+    blocked = {t.strip().lower() for t in os.getenv("BLOCKED_RESOURCES", "image,font,media").split(",") if t.strip()}
 
-@dataclass
+    def is_heavy(request: Request) -> bool:
+        return request.resource_type in blocked or bool(BLOCKED_HOSTS.search(urlparse(request.url).hostname or ""))
+
+    return is_heavy
+
+
+def block_heavy_resources(context: BrowserContext) -> None:
+    """
+    Abort heavy/irrelevant requests for every page in `context`.
+    BLOCK_HEAVY=false disables it; BLOCKED_RESOURCES overrides the resource types (default image,font,media).
+    """
+    is_heavy = _heavy_filter()
+    if is_heavy is None:
+        return
+
+    def _block(route: Route, request: Request) -> None:
+        if is_heavy(request):
+            route.abort()
+        else:
+            route.continue_()
+
+    context.route("**/*", _block)
+
+
+async def block_heavy_resources_async(context) -> None:
+    """`block_heavy_resources` for async_playwright contexts."""
+    is_heavy = _heavy_filter()
+    if is_heavy is None:
+        return
+
+    async def _block(route, request) -> None:
+        if is_heavy(request):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await context.route("**/*", _block)
+
+
+# Immutable and slotted: one compact object per step, handed straight to orjson.
+@dataclass(slots=True, frozen=True)
 class Step:
     name: str
     passed: bool
@@ -62,27 +294,70 @@ class Step:
     at: str
 
 
+class StepLog:
+    """
+    Append-only run_dir/steps.jsonl: every Step hits the file as soon as it is recorded, so a crashed
+    run keeps its partial results. Only the pass/fail counts are held in memory.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.passed = 0
+        self.failed = 0
+        self._fh = path.open("ab")
+
+    @property
+    def total(self) -> int:
+        return self.passed + self.failed
+
+    def append(self, step: Step) -> None:
+        self._fh.write(dumps_bytes(step) + b"\n")
+        # Hand each line to the OS right away (a killed process keeps it); fsync only once, on close.
+        self._fh.flush()
+        if step.passed:
+            self.passed += 1
+        else:
+            self.failed += 1
+
+    def close(self) -> None:
+        if self._fh.closed:
+            return
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._fh.close()
+
+    def __enter__(self) -> StepLog:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
 def write_result(
     out_path: Path,
     *,
     base_url: str,
     test_email: str,
-    steps: list[Step],
+    steps: StepLog,
     artifacts: dict,
 ) -> None:
+    """Close `steps` and write the compact run summary; the per-step records live in steps.jsonl."""
+    # Every screenshot path referenced by `steps` must exist before the result is published.
+    flush_shots()
+    steps.close()
     summary = {
         "run_at_utc": now_utc(),
         "base_url": base_url,
         "email": test_email,
         "summary": {
-            "total": len(steps),
-            "passed": sum(1 for s in steps if s.passed),
-            "failed": sum(1 for s in steps if not s.passed),
+            "total": steps.total,
+            "passed": steps.passed,
+            "failed": steps.failed,
         },
         "artifacts": artifacts,
-        "steps": [asdict(s) for s in steps],
+        "steps_jsonl": steps.path.name,
     }
-    out_path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    out_path.write_bytes(dumps_bytes(summary, indent=True))
 
 
 def require_env(key: str) -> str:
@@ -90,3 +365,132 @@ def require_env(key: str) -> str:
     if not v:
         raise SystemExit(f"Missing required env var: {key}")
     return v
+
+
+def _flag(key: str, default: str = "false") -> bool:
+    return os.getenv(key, default).lower() in ("1", "true", "yes")
+
+
+@dataclass(frozen=True)
+class Config:
+    base_url: str
+    test_email: str
+    test_password: str
+    login_path: str
+    post_login_path: str
+    email_sel: str
+    pass_sel: str
+    submit_sel: str
+    slow_mo: int
+    headless: bool
+    mutating: bool
+    enable_outputs_crud: bool
+    nav_timeout_ms: int
+
+
+def load_cfg() -> Config:
+    """Snapshot the shared Smoke/Use env once (after .env is loaded) into typed settings."""
+    return Config(
+        base_url=require_env("BASE_URL").rstrip("/"),
+        test_email=require_env("TEST_EMAIL"),
+        test_password=require_env("TEST_PASSWORD"),
+        login_path=os.getenv("LOGIN_PATH", "/login"),
+        post_login_path=os.getenv("POST_LOGIN_PATH", "/dashboards"),
+        email_sel=os.getenv("EMAIL_SELECTOR", "input[type='email']"),
+        pass_sel=os.getenv("PASSWORD_SELECTOR", "input[type='password']"),
+        submit_sel=os.getenv("SUBMIT_SELECTOR", "button[type='submit']"),
+        slow_mo=int(os.getenv("SLOW_MO_MS", "0" if os.getenv("CI") else "60")),
+        headless=_flag("HEADLESS"),
+        mutating=_flag("MUTATING_TESTS"),
+        enable_outputs_crud=_flag("ENABLE_OUTPUTS_CRUD"),
+        nav_timeout_ms=int(os.getenv("NAV_TIMEOUT_MS", "15000")),
+    )
+
+
+def _landed(page, cfg: Config) -> bool:
+    return page.url.startswith(cfg.base_url) and ("/login" not in page.url)
+
+
+def do_ui_login(page: Page, cfg: Config) -> bool:
+    """
+    Log in through the form; True once the app has navigated away from the login page.
+    The fallback for when no cached/API session is available (see auth.get_storage_state).
+    """
+    page.goto(f"{cfg.base_url}{cfg.login_path}", wait_until="domcontentloaded", timeout=60000)
+    for sel, value in ((cfg.email_sel, cfg.test_email), (cfg.pass_sel, cfg.test_password)):
+        page.locator(sel).first.fill(value)
+    page.locator(cfg.submit_sel).first.click()
+    # Wait for the SPA router to leave the login page rather than sleeping a fixed amount.
+    try:
+        page.wait_for_url(lambda u: "/login" not in u, timeout=10000)
+    except Exception:
+        pass
+    return _landed(page, cfg)
+
+
+async def do_ui_login_async(page, cfg: Config) -> bool:
+    """`do_ui_login` for async_playwright pages."""
+    await page.goto(f"{cfg.base_url}{cfg.login_path}", wait_until="domcontentloaded", timeout=60000)
+    for sel, value in ((cfg.email_sel, cfg.test_email), (cfg.pass_sel, cfg.test_password)):
+        await page.locator(sel).first.fill(value)
+    await page.locator(cfg.submit_sel).first.click()
+    try:
+        await page.wait_for_url(lambda u: "/login" not in u, timeout=10000)
+    except Exception:
+        pass
+    return _landed(page, cfg)
+
+
+def open_logged_in(pool, cfg: Config, **ctx_kwargs) -> tuple[BrowserContext, Page, bool, bool]:
+    """
+    Open a context on `pool` (a driver.BrowserPool) logged in as cfg.test_email, with heavy resources blocked.
+    Prefers a cached/API-issued session (auth.get_storage_state) if the app still accepts it at POST_LOGIN_PATH,
+    else falls back to the login form. Returns (context, page, logged_in, via_api).
+    """
+    try:
+        auth_state = get_storage_state(pool.playwright, cfg.base_url, cfg.test_email, cfg.test_password)
+    except Exception as exc:
+        print(f"[auth] API login unavailable, using UI login: {exc}")
+        auth_state = {}
+    context = pool.new_context(storage_state=auth_state or None, **ctx_kwargs)
+    block_heavy_resources(context)
+    page = context.new_page()
+
+    via_api = False
+    if auth_state:
+        page.goto(f"{cfg.base_url}{cfg.post_login_path}", wait_until="domcontentloaded", timeout=60000)
+        via_api = _landed(page, cfg)
+        if not via_api:
+            invalidate_auth(cfg.base_url, cfg.test_email)
+    logged_in = via_api
+    if not logged_in:
+        logged_in = do_ui_login(page, cfg)
+        if logged_in:
+            # Cache the form-issued session so the next run doesn't repeat the failed API login and the form.
+            save_auth_state(cfg.base_url, cfg.test_email, context.storage_state())
+    return context, page, logged_in, via_api
+
+
+async def open_logged_in_async(browser, cfg: Config, **ctx_kwargs) -> tuple:
+    """
+    `open_logged_in` for an async_playwright browser. The API login is sync-only, so this reuses a fresh
+    cached session (auth.cached_state) when there is one, else logs in through the form.
+    Returns (context, page, logged_in, via_cache).
+    """
+    auth_state = cached_state(cfg.base_url, cfg.test_email)
+    context = await browser.new_context(storage_state=auth_state or None, **ctx_kwargs)
+    await block_heavy_resources_async(context)
+    page = await context.new_page()
+
+    via_cache = False
+    if auth_state:
+        await page.goto(f"{cfg.base_url}{cfg.post_login_path}", wait_until="domcontentloaded", timeout=60000)
+        via_cache = _landed(page, cfg)
+        if not via_cache:
+            invalidate_auth(cfg.base_url, cfg.test_email)
+    logged_in = via_cache
+    if not logged_in:
+        logged_in = await do_ui_login_async(page, cfg)
+        if logged_in:
+            save_auth_state(cfg.base_url, cfg.test_email, await context.storage_state())
+    return context, page, logged_in, via_cache
@@ -0,0 +1,138 @@
+"""
+Shared browser driver: launch Chromium once per process and hand out fresh BrowserContexts.
+
+Contexts are cheap; browser launches are not. Smoke/Use call `BrowserPool.get()` instead of
+launching their own browser, so running them back-to-back in one process (see `main()` below)
+pays the launch cost once. The browser is closed at interpreter exit.
+
+Env:
+- PLAYWRIGHT_WS_ENDPOINT: connect to an already-running Playwright server instead of launching
+  (e.g. one started in CI with `playwright run-server`), removing launch cost entirely.
+
+Usage (PowerShell):
+  cd app/agentic-portal/runtest
+  python driver.py        # Smoke Test then Use Test, one browser
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+from pathlib import Path
+
+from playwright.async_api import Browser as AsyncBrowser, Playwright as AsyncPlaywright
+from playwright.sync_api import Browser, BrowserContext, Playwright, sync_playwright
+
+from common import load_dotenv
+
+
+HERE = Path(__file__).resolve().parent
+
+
+def launch_browser(p: Playwright, **launch_kwargs) -> Browser:
+    ws_endpoint = os.getenv("PLAYWRIGHT_WS_ENDPOINT", "").strip()
+    if ws_endpoint:
+        return p.chromium.connect(ws_endpoint, slow_mo=launch_kwargs.get("slow_mo", 0))
+    return p.chromium.launch(**launch_kwargs)
+
+
+async def launch_browser_async(p: AsyncPlaywright, **launch_kwargs) -> AsyncBrowser:
+    """`launch_browser` for async_playwright."""
+    ws_endpoint = os.getenv("PLAYWRIGHT_WS_ENDPOINT", "").strip()
+    if ws_endpoint:
+        return await p.chromium.connect(ws_endpoint, slow_mo=launch_kwargs.get("slow_mo", 0))
+    return await p.chromium.launch(**launch_kwargs)
+
+
+class BrowserPool:
+    """
+    Process-wide lazy browser. Use as a context manager: contexts opened inside the `with`
+    block are closed on exit, the browser stays up for the next caller.
+
+    The sync Playwright API is thread-affine, so use the pool from the thread that created it.
+    """
+
+    _instance: BrowserPool | None = None
+
+    def __init__(self, **launch_kwargs) -> None:
+        self._launch_kwargs = launch_kwargs
+        self._p: Playwright | None = None
+        self._browser: Browser | None = None
+        self._contexts: list[BrowserContext] = []
+
+    @classmethod
+    def get(cls, **launch_kwargs) -> BrowserPool:
+        """Return the shared pool; `launch_kwargs` only apply to the first (launching) call."""
+        if cls._instance is None:
+            cls._instance = cls(**launch_kwargs)
+            atexit.register(cls._instance.close)
+        return cls._instance
+
+    @property
+    def browser(self) -> Browser:
+        if self._browser is None:
+            self._p = sync_playwright().start()
+            self._browser = launch_browser(self._p, **self._launch_kwargs)
+        return self._browser
+
+    @property
+    def playwright(self) -> Playwright:
+        _ = self.browser
+        assert self._p is not None
+        return self._p
+
+    def new_context(self, **kwargs) -> BrowserContext:
+        ctx = self.browser.new_context(**kwargs)
+        self._contexts.append(ctx)
+        return ctx
+
+    def close_contexts(self) -> None:
+        while self._contexts:
+            ctx = self._contexts.pop()
+            try:
+                ctx.close()
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        self.close_contexts()
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            finally:
+                self._browser = None
+        if self._p is not None:
+            self._p.stop()
+            self._p = None
+
+    def __enter__(self) -> BrowserPool:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close_contexts()
+
+
+def run_smoke() -> None:
+    import run_smoke_test
+
+    run_smoke_test.main()
+
+
+def run_use() -> None:
+    import run_use_test
+
+    run_use_test.main()
+
+
+def main() -> None:
+    load_dotenv(HERE / ".env")
+    run_smoke()
+    run_use()
+
+
+if __name__ == "__main__":
+    # Re-enter through the importable module so the suites (which `import driver`) share this pool
+    # rather than a second copy of BrowserPool living in __main__.
+    import driver
+
+    driver.main()
@@ -4,119 +4,156 @@ Smoke Test (repeatable): log in, then visit a list of routes and assert the app
 Customize:
 - runtest/.env (ignored) for BASE_URL/TEST_EMAIL/TEST_PASSWORD and login selectors
 - runtest/paths.txt for the routes to cover
+- SMOKE_PARALLEL (default 4) for how many tabs load routes concurrently, in one browser (1 = sequential)
+- NAV_TIMEOUT_MS (default 15000) for each route navigation; the login page keeps a 60s budget
+- SPA_PUSHSTATE=true to route client-side (no document load) once the app is loaded, if it looks like an SPA
+- SLOW_MO_MS for a per-action delay: default 60 for watching local runs, 0 when CI is set
 """
 
 from __future__ import annotations
 
+import itertools
 import os
+import re
+import time
 from pathlib import Path
-
-from playwright.sync_api import sync_playwright
-
-from common import Step, load_dotenv, mk_run_dir, now_utc, require_env, shot, write_result
+from typing import Any, Iterator
+
+from common import (
+    Step,
+    StepLog,
+    detect_spa,
+    load_cfg,
+    load_dotenv,
+    mk_run_dir,
+    now_utc,
+    open_logged_in,
+    settle_visit,
+    shot,
+    start_visit,
+    write_result,
+)
+from driver import BrowserPool
 
 
 HERE = Path(__file__).resolve().parent
 RUN_ROOT = HERE / "runs"
 
+# First token of every non-blank, non-comment line in paths.txt.
+_PATH_RE = re.compile(r"(?m)^\s*(?!#)(\S+)")
+
+# Case-insensitive JS RegExp sources matched against the rendered page text.
+_NF_RE = r"this page could not be found\.|\b404\b|\bnot found\b"
+_FORBIDDEN_RE = r"forbidden|access denied|not authorized|unauthorized"
+# Every post-navigation assertion in one CDP round trip.
+_PROBE_JS = """([nf, fb]) => {
+  const t = (document.body && document.body.innerText) || '';
+  return {
+    url: location.href,
+    nf: new RegExp(nf, 'i').test(t),
+    fb: new RegExp(fb, 'i').test(t),
+    has_main: !!document.querySelector('main,[role=main],[data-testid]'),
+  };
+}"""
+
+
+def iter_paths() -> Iterator[str]:
+    """Yield routes from paths.txt as they are read, so the first visit doesn't wait on the whole file."""
+    with (HERE / "paths.txt").open(encoding="utf-8") as fh:
+        for line in fh:
+            m = _PATH_RE.match(line)
+            if m:
+                s = m.group(1)
+                yield s if s.startswith("/") else "/" + s
+
+
+def probe_route(page, resp) -> tuple[bool, str]:
+    status = resp.status if resp else None
+    # Avoid false positives from static strings in HTML; only fail on rendered "not found" text.
+    try:
+        probe = page.evaluate(_PROBE_JS, [_NF_RE, _FORBIDDEN_RE])
+    except Exception:
+        probe = {}
+    is_nf = bool(probe.get("nf"))
+    is_forbidden = bool(probe.get("fb"))
+
+    # Pass if HTTP status is OK-ish, or page is restricted (smoke should still treat as reachable).
+    ok_status = status is None or (200 <= status < 400) or status == 403
+    ok = ok_status and (not is_nf)
+    if is_forbidden:
+        ok = True
+
+    note = str(probe.get("url") or page.url)
+    if status is not None:
+        note += f" status={status}"
+    if is_forbidden:
+        note += " (restricted)"
+    if probe and not probe.get("has_main"):
+        note += " (no main landmark)"
+    return ok, note
+
+
+def visit_wave(tabs: list, wave: list[str], *, base_url: str, nav_timeout_ms: int, spa: bool) -> Iterator[tuple[Any, str, bool, str]]:
+    """
+    Start every route in `wave` on its own tab, then settle and probe each tab in turn, so the loads
+    overlap on one thread and one browser. Yields (tab, path, ok, note) in `wave` order.
+    """
+    started: list[tuple[Any, str, float, Any, str | None, Exception | None]] = []
+    for tab, path in zip(tabs, wave):
+        t0 = time.monotonic()
+        try:
+            resp, from_path = start_visit(tab, base_url, path, spa=spa, timeout_ms=nav_timeout_ms)
+            started.append((tab, path, t0, resp, from_path, None))
+        except Exception as exc:
+            started.append((tab, path, t0, None, None, exc))
+
+    # Each route keeps its own NAV_TIMEOUT_MS budget, counted from its own start.
+    for tab, path, t0, resp, from_path, err in started:
+        if err is None:
+            try:
+                settle_visit(tab, path, from_path=from_path, timeout_ms=nav_timeout_ms, started=t0)
+                ok, note = probe_route(tab, resp)
+            except Exception as exc:
+                err = exc
+        if err is not None:
+            ok, note = False, str(err)
+        yield tab, path, ok, note
+
 
-def read_paths() -> list[str]:
-    p = HERE / "paths.txt"
-    out: list[str] = []
-    for raw in p.read_text(encoding="utf-8").splitlines():
-        s = raw.strip()
-        if not s or s.startswith("#"):
-            continue
-        if not s.startswith("/"):
-            s = "/" + s
-        out.append(s)
-    return out
+def record_step(page, shots_dir: Path, name: str, ok: bool, note: str = "") -> Step:
+    step = Step(name=name, passed=ok, note=note, screenshot=shot(page, shots_dir, name), at=now_utc())
+    print(("[PASS]" if ok else "[FAIL]"), name, "-", note)
+    return step
 
 
 def main() -> None:
     load_dotenv(HERE / ".env")
 
-    base_url = require_env("BASE_URL").rstrip("/")
-    test_email = require_env("TEST_EMAIL")
-    test_password = require_env("TEST_PASSWORD")
-
-    login_path = os.getenv("LOGIN_PATH", "/login")
-    email_sel = os.getenv("EMAIL_SELECTOR", "input[type='email']")
-    pass_sel = os.getenv("PASSWORD_SELECTOR", "input[type='password']")
-    submit_sel = os.getenv("SUBMIT_SELECTOR", "button[type='submit']")
-
-    slow_mo = int(os.getenv("SLOW_MO_MS", "60"))
-    headless = os.getenv("HEADLESS", "false").lower() in ("1", "true", "yes")
+    cfg = load_cfg()
+    parallel = max(1, int(os.getenv("SMOKE_PARALLEL", "4")))
 
     run_dir, shots_dir = mk_run_dir(RUN_ROOT, "smoke_test")
-    steps: list[Step] = []
 
     def log(name: str, ok: bool, note: str = "") -> None:
-        steps.append(Step(name=name, passed=ok, note=note, screenshot=shot(page, shots_dir, name), at=now_utc()))
-        print(("[PASS]" if ok else "[FAIL]"), name, "-", note)
-
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=headless, slow_mo=slow_mo)
-        context = browser.new_context(viewport={"width": 1600, "height": 1000})
-        page = context.new_page()
-
-        # Login
-        page.goto(f"{base_url}{login_path}", wait_until="domcontentloaded", timeout=60000)
-        page.locator(email_sel).first.fill(test_email)
-        page.locator(pass_sel).first.fill(test_password)
-        page.locator(submit_sel).first.click(force=True)
-
-        # Give SPA routers time to settle.
-        page.wait_for_timeout(1200)
-        logged_in = page.url.startswith(base_url) and ("/login" not in page.url)
-        log("Login", logged_in, page.url)
+        steps.append(record_step(page, shots_dir, name, ok, note))
+
+    with StepLog(run_dir / "steps.jsonl") as steps, BrowserPool.get(headless=cfg.headless, slow_mo=cfg.slow_mo) as pool:
+        context, page, logged_in, via_api = open_logged_in(pool, cfg, viewport={"width": 1600, "height": 1000})
+        log("Login", logged_in, page.url + (" (api session)" if via_api else ""))
         if not logged_in:
-            write_result(run_dir / "result.json", base_url=base_url, test_email=test_email, steps=steps, artifacts={})
-            context.close()
-            browser.close()
+            write_result(run_dir / "result.json", base_url=cfg.base_url, test_email=cfg.test_email, steps=steps, artifacts={})
             return
 
-        # Visit routes
-        for path in read_paths():
-            try:
-                resp = page.goto(f"{base_url}{path}", wait_until="domcontentloaded", timeout=60000)
-                page.wait_for_timeout(600)
-
-                status = resp.status if resp else None
-                # Avoid false positives from static strings in HTML; only fail on visible "not found" patterns.
-                not_found = page.locator("text=/this page could not be found\\.|\\b404\\b|\\bnot found\\b/i").first
-                forbidden = page.locator("text=/forbidden|access denied|not authorized|unauthorized/i").first
-
-                is_nf = False
-                is_forbidden = False
-                try:
-                    is_nf = not_found.count() > 0 and not_found.is_visible()
-                except Exception:
-                    is_nf = False
-                try:
-                    is_forbidden = forbidden.count() > 0 and forbidden.is_visible()
-                except Exception:
-                    is_forbidden = False
-
-                # Pass if HTTP status is OK-ish, or page is restricted (smoke should still treat as reachable).
-                ok_status = status is None or (200 <= status < 400) or status == 403
-                ok = ok_status and (not is_nf)
-                if is_forbidden:
-                    ok = True
-
-                note = page.url
-                if status is not None:
-                    note += f" status={status}"
-                if is_forbidden:
-                    note += " (restricted)"
-                log(f"Visit {path}", ok, note)
-            except Exception as exc:
-                log(f"Visit {path}", False, str(exc))
-
-        context.close()
-        browser.close()
+        # Visit routes: up to SMOKE_PARALLEL loads in flight at once, on tabs of the logged-in context.
+        spa = detect_spa(page)
+        tabs = [page]
+        paths = iter_paths()
+        while wave := list(itertools.islice(paths, parallel)):
+            tabs.extend(context.new_page() for _ in range(len(wave) - len(tabs)))
+            for tab, path, ok, note in visit_wave(tabs, wave, base_url=cfg.base_url, nav_timeout_ms=cfg.nav_timeout_ms, spa=spa):
+                steps.append(record_step(tab, shots_dir, f"Visit {path}", ok, note))
 
-    write_result(run_dir / "result.json", base_url=base_url, test_email=test_email, steps=steps, artifacts={})
+    write_result(run_dir / "result.json", base_url=cfg.base_url, test_email=cfg.test_email, steps=steps, artifacts={})
     print(f"Result file: {run_dir / 'result.json'}")
 
 
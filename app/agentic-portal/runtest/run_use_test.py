@@ -5,122 +5,144 @@ Guidelines:
 - Keep it surgical: 8-20 steps that cover the biggest regression surface.
 - Create test artifacts (records, toggles) and then delete/revert them.
 - Prefer stable selectors (data-testid). If you control the app, add them.
+
+SLOW_MO_MS sets a per-action delay: default 60 for watching local runs, 0 when CI is set.
 """
 
 from __future__ import annotations
 
-import os
+import functools
+import json
+import re
 import time
 from pathlib import Path
 
-from playwright.sync_api import sync_playwright
-
-from common import Step, load_dotenv, mk_run_dir, now_utc, require_env, shot, write_result
+from common import (
+    Step,
+    StepLog,
+    detect_spa,
+    load_cfg,
+    load_dotenv,
+    mk_run_dir,
+    now_utc,
+    open_logged_in,
+    shot,
+    visit,
+    write_result,
+)
+from driver import BrowserPool
 
 
 HERE = Path(__file__).resolve().parent
 RUN_ROOT = HERE / "runs"
 
+# First token of every non-blank, non-comment line in paths.txt.
+_PATH_RE = re.compile(r"(?m)^\s*(?!#)(\S+)")
 
-def read_paths() -> list[str]:
+
+# (keyword, weight) pairs for prioritize_use_paths, highest priority first.
+_PATH_WEIGHTS = tuple(
+    (k, 100 - i * 5) for i, k in enumerate(("dashboard", "report", "setting", "wallet", "account", "action"))
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _read_paths() -> tuple[str, ...]:
     p = HERE / "paths.txt"
     if not p.exists():
-        return ["/dashboard", "/reports", "/settings"]
-    out: list[str] = []
-    for raw in p.read_text(encoding="utf-8").splitlines():
-        s = raw.strip()
-        if not s or s.startswith("#"):
-            continue
-        if not s.startswith("/"):
-            s = "/" + s
-        out.append(s)
-    return out
+        return ("/dashboard", "/reports", "/settings")
+    text = p.read_text(encoding="utf-8")
+    return tuple(s if s.startswith("/") else "/" + s for s in _PATH_RE.findall(text))
+
+
+def read_paths() -> list[str]:
+    return list(_read_paths())
 
 
 def prioritize_use_paths(paths: list[str], limit: int = 8) -> list[str]:
-    keys = ("dashboard", "report", "setting", "wallet", "account", "action")
     def score(p: str) -> int:
-        s = 0
         lp = p.lower()
-        for i, k in enumerate(keys):
-            if k in lp:
-                s += 100 - i * 5
+        s = sum(w for k, w in _PATH_WEIGHTS if k in lp)
         s -= p.count("/") * 2
         return s
+
     uniq = list(dict.fromkeys(paths))
-    return sorted(uniq, key=lambda p: (-score(p), p))[:limit]
+    # Score each path once up front; (-score, path) sorts exactly like the old (key, tie-break) pair.
+    scored = [(-score(p), p) for p in uniq]
+    scored.sort()
+    return [p for _, p in scored[:limit]]
 
-def api_call(page, *, path: str, method: str = "GET", body: dict | None = None) -> dict:
+def api_call(ctx, *, path: str, method: str = "GET", body: dict | None = None) -> dict:
     """
-    Call app API using the authenticated browser context (cookies/session).
+    Call app API through the context's APIRequestContext (shares the logged-in cookies).
+    Talks HTTP from the driver directly, so no renderer/JS round trip per call.
+    `ctx` must be created with base_url so relative /api paths resolve.
     Returns: { ok, status, json, text }
     """
+    resp = ctx.request.fetch(path, method=method, data=body)
+    t = resp.text()
+    try:
+        j = json.loads(t) if t else None
+    except ValueError:
+        j = None
+    return {"ok": resp.ok, "status": resp.status, "json": j, "text": t}
+
+
+def api_get_many(page, paths: list[str]) -> list[dict]:
+    """
+    Issue independent GETs concurrently in a single page.evaluate (one driver round trip, parallel on the wire).
+    The sync API is thread-affine and context.request calls can't overlap, so concurrent reads go through
+    the page's fetch (same cookies); single calls use `api_call`.
+    Returns results in the same order: [{ ok, status, json, text }]
+    """
+    if not paths:
+        return []
     return page.evaluate(
-        """async ({path, method, body}) => {
-          const init = {
-            method,
-            headers: { 'Content-Type': 'application/json' },
-            body: body ? JSON.stringify(body) : undefined,
-          };
-          const r = await fetch(path, init);
-          const t = await r.text();
-          let j = null;
-          try { j = t ? JSON.parse(t) : null; } catch { j = null; }
-          return { ok: r.ok, status: r.status, json: j, text: t };
-        }""",
-        {"path": path, "method": method, "body": body},
+        """async (paths) => Promise.all(paths.map(async (path) => {
+          try {
+            const r = await fetch(path);
+            const t = await r.text();
+            let j = null;
+            try { j = t ? JSON.parse(t) : null; } catch { j = null; }
+            return { ok: r.ok, status: r.status, json: j, text: t };
+          } catch (e) {
+            return { ok: false, status: 0, json: null, text: String(e) };
+          }
+        }))""",
+        paths,
     )
 
 
 def main() -> None:
     load_dotenv(HERE / ".env")
-
-    base_url = require_env("BASE_URL").rstrip("/")
-    test_email = require_env("TEST_EMAIL")
-    test_password = require_env("TEST_PASSWORD")
-
-    login_path = os.getenv("LOGIN_PATH", "/login")
-    email_sel = os.getenv("EMAIL_SELECTOR", "input[type='email']")
-    pass_sel = os.getenv("PASSWORD_SELECTOR", "input[type='password']")
-    submit_sel = os.getenv("SUBMIT_SELECTOR", "button[type='submit']")
-
-    slow_mo = int(os.getenv("SLOW_MO_MS", "60"))
-    headless = os.getenv("HEADLESS", "false").lower() in ("1", "true", "yes")
-    mutating = os.getenv("MUTATING_TESTS", "false").lower() in ("1", "true", "yes")
-    enable_outputs_crud = os.getenv("ENABLE_OUTPUTS_CRUD", "false").lower() in ("1", "true", "yes")
+    cfg = load_cfg()
 
     run_dir, shots_dir = mk_run_dir(RUN_ROOT, "use_test")
     downloads_dir = run_dir / "downloads"
     downloads_dir.mkdir(parents=True, exist_ok=True)
-    steps: list[Step] = []
     downloads: list[str] = []
 
     def log(name: str, ok: bool, note: str = "") -> None:
         steps.append(Step(name=name, passed=ok, note=note, screenshot=shot(page, shots_dir, name), at=now_utc()))
         print(("[PASS]" if ok else "[FAIL]"), name, "-", note)
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=headless, slow_mo=slow_mo)
-        context = browser.new_context(viewport={"width": 1600, "height": 1000}, accept_downloads=True)
-        page = context.new_page()
-
-        # Login
-        page.goto(f"{base_url}{login_path}", wait_until="domcontentloaded", timeout=60000)
-        page.locator(email_sel).first.fill(test_email)
-        page.locator(pass_sel).first.fill(test_password)
-        page.locator(submit_sel).first.click(force=True)
-        page.wait_for_timeout(1200)
-        logged_in = page.url.startswith(base_url) and ("/login" not in page.url)
-        log("Login", logged_in, page.url)
+    with StepLog(run_dir / "steps.jsonl") as steps, BrowserPool.get(headless=cfg.headless, slow_mo=cfg.slow_mo) as pool:
+        context, page, logged_in, via_api = open_logged_in(
+            pool,
+            cfg,
+            base_url=cfg.base_url,
+            viewport={"width": 1600, "height": 1000},
+            accept_downloads=True,
+        )
+        log("Login", logged_in, page.url + (" (api session)" if via_api else ""))
         if not logged_in:
-            write_result(run_dir / "result.json", base_url=base_url, test_email=test_email, steps=steps, artifacts={})
-            context.close()
-            browser.close()
+            write_result(run_dir / "result.json", base_url=cfg.base_url, test_email=cfg.test_email, steps=steps, artifacts={})
             return
+        spa = detect_spa(page)
 
         # App-specific "USE" coverage for Agentic Portal (CRUD via /api/*), guarded behind MUTATING_TESTS.
         created = {"workstream_id": None, "dashboard_id": None, "output_id": None}
-        if mutating:
+        if cfg.mutating:
             suffix = str(int(time.time()))
             ws_name = f"USE WS {suffix}"
             dash_name = f"USE Dashboard {suffix}"
@@ -128,7 +150,7 @@ def main() -> None:
 
             try:
                 ws = api_call(
-                    page,
+                    context,
                     path="/api/workstreams",
                     method="POST",
                     body={"name": ws_name, "description": "Use Test workstream", "color": "#0ea5e9"},
@@ -141,26 +163,54 @@ def main() -> None:
 
             ws_id = created["workstream_id"]
             if ws_id:
-                # Verify it shows up in list API
-                lst = api_call(page, path="/api/workstreams")
-                names = [w.get("name") for w in (lst.get("json") or {}).get("workstreams", []) if isinstance(w, dict)]
-                log("Workstream in list (api)", ws_name in names, f"count={len(names)}")
-
                 # Create a dashboard under the workstream
                 dash = api_call(
-                    page,
+                    context,
                     path="/api/dashboards",
                     method="POST",
                     body={"name": dash_name, "description": "Use Test dashboard", "workstreamId": ws_id, "viewIds": []},
                 )
                 ok_dash = bool(dash.get("ok")) and (dash.get("json") or {}).get("dashboard", {}).get("id")
                 created["dashboard_id"] = (dash.get("json") or {}).get("dashboard", {}).get("id") if ok_dash else None
-                log("Create dashboard (api)", ok_dash, f"status={dash.get('status')} id={created['dashboard_id']}")
+                dash_note = f"status={dash.get('status')} id={created['dashboard_id']}"
 
                 dash_id = created["dashboard_id"]
+                out_step: tuple[bool, str] | None = None
+                # Optional Outputs CRUD (disabled by default): output APIs appear inconsistent on some deployments.
+                if dash_id and cfg.enable_outputs_crud:
+                    out = api_call(
+                        context,
+                        path="/api/outputs",
+                        method="POST",
+                        body={"name": out_name, "type": "csv", "workstreamId": ws_id, "dashboardId": dash_id, "config": {"schedule": "manual"}},
+                    )
+                    post_id = (out.get("json") or {}).get("output", {}).get("id")
+                    post_org = (out.get("json") or {}).get("output", {}).get("organizationId")
+                    ok_out = bool(out.get("ok")) and bool(post_id)
+                    created["output_id"] = post_id if ok_out else None
+                    out_step = (ok_out, f"status={out.get('status')} id={post_id} org={post_org}")
+
+                # The verification reads don't depend on each other: issue them together, then log creates and
+                # checks in their usual order (API calls don't touch the page, so the screenshots are unchanged).
+                reads = {"workstreams": "/api/workstreams"}
+                if dash_id:
+                    reads["dashboards"] = f"/api/dashboards?workstreamId={ws_id}"
+                    if cfg.enable_outputs_crud:
+                        reads["outputs"] = f"/api/outputs?workstreamId={ws_id}"
+                        reads["me"] = "/api/auth/me"
+                        if created.get("output_id"):
+                            reads["output"] = f"/api/outputs/{created['output_id']}"
+                got = dict(zip(reads, api_get_many(page, list(reads.values()))))
+
+                # Verify it shows up in list API
+                lst = got["workstreams"]
+                names = [w.get("name") for w in (lst.get("json") or {}).get("workstreams", []) if isinstance(w, dict)]
+                log("Workstream in list (api)", ws_name in names, f"count={len(names)}")
+                log("Create dashboard (api)", ok_dash, dash_note)
+
                 if dash_id:
                     # Verify list endpoints (best-effort)
-                    ds = api_call(page, path=f"/api/dashboards?workstreamId={ws_id}")
+                    ds = got["dashboards"]
                     dash_list = [d for d in (ds.get("json") or {}).get("dashboards", []) if isinstance(d, dict)]
                     dash_names = [d.get("name") for d in dash_list]
                     log("Dashboard in list (api)", dash_name in dash_names, f"count={len(dash_names)}")
@@ -168,32 +218,21 @@ def main() -> None:
                         d0 = dash_list[0]
                         log("Dashboard list sample (api)", True, f"id={d0.get('id')} org={d0.get('organizationId')}")
 
-                    # Optional Outputs CRUD (disabled by default): output APIs appear inconsistent on some deployments.
-                    if enable_outputs_crud:
-                        out = api_call(
-                            page,
-                            path="/api/outputs",
-                            method="POST",
-                            body={"name": out_name, "type": "csv", "workstreamId": ws_id, "dashboardId": dash_id, "config": {"schedule": "manual"}},
-                        )
-                        post_id = (out.get("json") or {}).get("output", {}).get("id")
-                        post_org = (out.get("json") or {}).get("output", {}).get("organizationId")
-                        ok_out = bool(out.get("ok")) and bool(post_id)
-                        created["output_id"] = post_id if ok_out else None
-                        log("Create output (api)", ok_out, f"status={out.get('status')} id={post_id} org={post_org}")
-
-                        os_resp = api_call(page, path=f"/api/outputs?workstreamId={ws_id}")
+                    if cfg.enable_outputs_crud:
+                        if out_step is not None:
+                            log("Create output (api)", *out_step)
+                        os_resp = got["outputs"]
                         outs = [o for o in (os_resp.get("json") or {}).get("outputs", []) if isinstance(o, dict)]
                         out_names = [o.get("name") for o in outs]
                         log("Output in list (api)", out_name in out_names, f"count={len(out_names)}")
                         if outs:
                             sample = outs[0]
                             log("Output list sample (api)", True, f"keys={sorted(sample.keys())} id={sample.get('id')}")
-                            me = api_call(page, path="/api/auth/me")
+                            me = got["me"]
                             me_org = (me.get("json") or {}).get("user", {}).get("organizationId") if isinstance(me.get("json"), dict) else None
                             log("Auth me (api)", bool(me.get("ok")), f"status={me.get('status')} org={me_org} out_org={sample.get('organizationId')}")
-                        if created.get("output_id"):
-                            g = api_call(page, path=f"/api/outputs/{created['output_id']}")
+                        if "output" in got:
+                            g = got["output"]
                             snippet = (g.get("text") or "").replace("\n", " ").strip()[:120]
                             log("Output fetch by id (api)", bool(g.get("ok")), f"status={g.get('status')} body={snippet}")
                     else:
@@ -203,14 +242,19 @@ def main() -> None:
                     ui_checks: list[tuple[str, str | None]] = [
                         ("/workstreams", ws_name),
                         ("/dashboards", dash_name),
-                        ("/outputs", out_name if enable_outputs_crud and created.get("output_id") else None),
+                        ("/outputs", out_name if cfg.enable_outputs_crud and created.get("output_id") else None),
                     ]
                     for ui_path, needle in ui_checks:
                         try:
-                            page.goto(f"{base_url}{ui_path}", wait_until="domcontentloaded", timeout=60000)
-                            page.wait_for_timeout(900)
+                            visit(page, cfg.base_url, ui_path, spa=spa, timeout_ms=cfg.nav_timeout_ms)
                             if needle:
-                                visible = page.locator(f"text='{needle}'").first.count() > 0
+                                # Lists render client-side; wait for the row instead of a fixed sleep.
+                                row = page.locator(f"text='{needle}'").first
+                                try:
+                                    row.wait_for(state="attached", timeout=5000)
+                                except Exception:
+                                    pass
+                                visible = row.count() > 0
                                 log(f"UI shows {ui_path}", visible, needle)
                             else:
                                 # No specific artifact expected; only assert page rendered.
@@ -221,21 +265,21 @@ def main() -> None:
             # Cleanup (reverse order)
             try:
                 if created.get("output_id"):
-                    r = api_call(page, path=f"/api/outputs/{created['output_id']}", method="DELETE")
+                    r = api_call(context, path=f"/api/outputs/{created['output_id']}", method="DELETE")
                     ok_del = bool(r.get("ok"))
                     # Some deployments return 404 on /api/outputs/:id despite the output being visible in lists.
                     # Treat cleanup as successful if the output is no longer present in list for this user/workstream.
                     if not ok_del:
-                        g = api_call(page, path=f"/api/outputs/{created['output_id']}")
+                        g = api_call(context, path=f"/api/outputs/{created['output_id']}")
                         snip = (g.get("text") or "").replace("\n", " ").strip()[:120]
                         log("Delete output (api)", False, f"del_status={r.get('status')} get_status={g.get('status')} body={snip}")
                     else:
                         log("Delete output (api)", True, f"status={r.get('status')}")
                 if created.get("dashboard_id"):
-                    r = api_call(page, path=f"/api/dashboards/{created['dashboard_id']}", method="DELETE")
+                    r = api_call(context, path=f"/api/dashboards/{created['dashboard_id']}", method="DELETE")
                     log("Delete dashboard (api)", bool(r.get("ok")), f"status={r.get('status')}")
                 if created.get("workstream_id"):
-                    r = api_call(page, path=f"/api/workstreams/{created['workstream_id']}", method="DELETE")
+                    r = api_call(context, path=f"/api/workstreams/{created['workstream_id']}", method="DELETE")
                     log("Delete workstream (api)", bool(r.get("ok")), f"status={r.get('status')}")
             except Exception as exc:
                 log("Cleanup (api)", False, str(exc))
@@ -243,10 +287,10 @@ def main() -> None:
         # Best-effort "use" coverage across key pages, without assuming domain semantics.
         # For deep correctness + CRUD flows, customize this file per app.
         use_paths = prioritize_use_paths(read_paths(), limit=8)
-        for path in use_paths:
+        run_ts = int(time.time())
+        for i, path in enumerate(use_paths):
             try:
-                page.goto(f"{base_url}{path}", wait_until="domcontentloaded", timeout=60000)
-                page.wait_for_timeout(600)
+                visit(page, cfg.base_url, path, spa=spa, timeout_ms=cfg.nav_timeout_ms)
                 log(f"Open {path}", True, page.url)
             except Exception as exc:
                 log(f"Open {path}", False, str(exc))
@@ -261,20 +305,17 @@ def main() -> None:
                     with page.expect_download(timeout=30000) as dl_info:
                         btn.click(force=True)
                     dl = dl_info.value
-                    out = downloads_dir / f"{path.strip('/').replace('/', '_') or 'root'}_{int(time.time())}"
+                    out = downloads_dir / f"{path.strip('/').replace('/', '_') or 'root'}_{run_ts}_{i}"
                     dl.save_as(str(out))
                     downloads.append(str(out))
                     log(f"Download on {path}", True, str(out))
                 except Exception as exc:
                     log(f"Download on {path}", False, str(exc))
 
-        context.close()
-        browser.close()
-
     write_result(
         run_dir / "result.json",
-        base_url=base_url,
-        test_email=test_email,
+        base_url=cfg.base_url,
+        test_email=cfg.test_email,
         steps=steps,
         artifacts={"downloads": downloads},
     )
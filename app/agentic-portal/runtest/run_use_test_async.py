@@ -0,0 +1,118 @@
+"""
+Use Test (async variant): the login + use_paths coverage of run_use_test.py on async_playwright.
+
+Export/Download files are saved in background tasks, so a large download is written to disk while
+the next route is already loading; every save is awaited before result.json is written.
+The mutating CRUD section (MUTATING_TESTS) is only in run_use_test.py.
+
+Reuses a still-fresh session from the auth cache (see auth.py), else logs in through the form.
+Same .env settings as run_use_test.py.
+
+Usage (PowerShell):
+  cd app/agentic-portal/runtest
+  python run_use_test_async.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+
+from playwright.async_api import async_playwright
+
+from common import (
+    Step,
+    StepLog,
+    load_cfg,
+    load_dotenv,
+    mk_run_dir,
+    ms_left,
+    now_utc,
+    open_logged_in_async,
+    shot_async,
+    wait_dom_ready_async,
+    write_result,
+)
+from driver import launch_browser_async
+from run_use_test import HERE, RUN_ROOT, prioritize_use_paths, read_paths
+
+
+async def amain() -> None:
+    load_dotenv(HERE / ".env")
+    cfg = load_cfg()
+
+    run_dir, shots_dir = mk_run_dir(RUN_ROOT, "use_test")
+    downloads_dir = run_dir / "downloads"
+    downloads_dir.mkdir(parents=True, exist_ok=True)
+    downloads: list[str] = []
+    saves: list[tuple[str, Path, asyncio.Task]] = []
+
+    async def log(name: str, ok: bool, note: str = "") -> None:
+        steps.append(Step(name=name, passed=ok, note=note, screenshot=await shot_async(page, shots_dir, name), at=now_utc()))
+        print(("[PASS]" if ok else "[FAIL]"), name, "-", note)
+
+    with StepLog(run_dir / "steps.jsonl") as steps:
+        async with async_playwright() as p:
+            browser = await launch_browser_async(p, headless=cfg.headless, slow_mo=cfg.slow_mo)
+            _, page, logged_in, via_cache = await open_logged_in_async(
+                browser, cfg, viewport={"width": 1600, "height": 1000}, accept_downloads=True
+            )
+            await log("Login", logged_in, page.url + (" (cached session)" if via_cache else ""))
+            if not logged_in:
+                write_result(run_dir / "result.json", base_url=cfg.base_url, test_email=cfg.test_email, steps=steps, artifacts={})
+                return
+
+            use_paths = prioritize_use_paths(read_paths(), limit=8)
+            run_ts = int(time.time())
+            for i, path in enumerate(use_paths):
+                started = time.monotonic()
+                try:
+                    await page.goto(f"{cfg.base_url}{path}", wait_until="commit", timeout=cfg.nav_timeout_ms)
+                    await wait_dom_ready_async(page, ms_left(started, cfg.nav_timeout_ms))
+                    await log(f"Open {path}", True, page.url)
+                except Exception as exc:
+                    await log(f"Open {path}", False, str(exc))
+                    continue
+
+                # If an export/download button is present, assert a real download occurs.
+                btn = page.locator(
+                    "button:has-text('Export'), button:has-text('Download'), a:has-text('Export'), a:has-text('Download')"
+                ).first
+                if await btn.count() > 0:
+                    try:
+                        async with page.expect_download(timeout=30000) as dl_info:
+                            await btn.click(force=True)
+                        dl = await dl_info.value
+                        out = downloads_dir / f"{path.strip('/').replace('/', '_') or 'root'}_{run_ts}_{i}"
+                        # Write the file in the background; the next route starts loading meanwhile.
+                        saves.append((path, out, asyncio.create_task(dl.save_as(str(out)))))
+                        await log(f"Download on {path}", True, str(out))
+                    except Exception as exc:
+                        await log(f"Download on {path}", False, str(exc))
+
+            # Every download must be on disk before the result is published.
+            results = await asyncio.gather(*(task for _, _, task in saves), return_exceptions=True)
+            for (path, out, _), res in zip(saves, results):
+                if isinstance(res, BaseException):
+                    await log(f"Save download {path}", False, str(res))
+                else:
+                    downloads.append(str(out))
+            await browser.close()
+
+    write_result(
+        run_dir / "result.json",
+        base_url=cfg.base_url,
+        test_email=cfg.test_email,
+        steps=steps,
+        artifacts={"downloads": downloads},
+    )
+    print(f"Result file: {run_dir / 'result.json'}")
+
+
+def main() -> None:
+    asyncio.run(amain())
+
+
+if __name__ == "__main__":
+    main()